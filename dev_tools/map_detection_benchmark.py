@@ -0,0 +1,247 @@
+import logging
+import os
+import time
+import tracemalloc
+
+import numpy as np
+from PIL import Image
+
+import module.config.server as server
+
+server.server = 'cn'  # Edit this to the server of your screenshots.
+
+from module.config.config import AzurLaneConfig
+from module.exception import MapDetectionError
+from module.logger import logger
+from module.map_detection.view import View
+
+"""
+This file is used to benchmark map detection (module/map_detection), outside Alas.
+It runs detection over saved map screenshots, so any performance change to detection
+can be evaluated without an emulator.
+
+Usage:
+    - Save map screenshots (1280x720) in <FOLDER>/<campaign>/<name>.png
+        such as ./screenshots/campaign_7_2/7-2_01.png
+    - (Optional) Label screenshots for accuracy. Save the local map view in <FOLDER>/<campaign>/<name>.txt,
+        one row per line, same as the output of `view.show()`. Run with `LABEL = True` to generate
+        the labels from current results, then correct them by hand.
+    - Paste the map config into `Config` if the screenshots need, such as MAP_HAS_SIREN.
+    - Run map_detection_benchmark.py
+
+Output:
+    Latency percentiles of each stage, peak memory, and accuracy against labels, for each backend.
+    Peak memory is measured in a separate pass, so tracing doesn't affect latency.
+    A new View is created for each campaign folder, state of homography and tracking is kept within a campaign.
+    Stages:
+        load: View.load(), including map detection and grid creation.
+        predict: View.predict()
+        predict.<name>: Each grid predictor, summed over grids.
+        backend.<name>: Stages of perspective backend.
+
+Arguments:
+    FOLDER:     Folder of screenshots.
+    BACKENDS:   Detection backends to compare.
+    REPEAT:     Run each screenshot multiple times.
+    LABEL:      True to save current results of the first backend as labels, existing labels are not overwritten.
+"""
+FOLDER = './screenshots'
+BACKENDS = ['homography', 'perspective']
+REPEAT = 3
+LABEL = False
+
+
+class Config:
+    """
+    Paste the config of map file here
+    """
+    pass
+
+
+def load_corpus(folder):
+    """
+    Args:
+        folder (str):
+
+    Returns:
+        list[tuple[str, str, np.ndarray, list[str]]]: (campaign, name, image, label).
+            Label is None if not labelled.
+    """
+    corpus = []
+    for campaign in sorted(os.listdir(folder)):
+        path = os.path.join(folder, campaign)
+        if not os.path.isdir(path):
+            continue
+        for file in sorted(os.listdir(path)):
+            name, ext = os.path.splitext(file)
+            if ext.lower() not in ['.png', '.jpg']:
+                continue
+            image = np.array(Image.open(os.path.join(path, file)).convert('RGB'))
+            label = os.path.join(path, f'{name}.txt')
+            if os.path.exists(label):
+                with open(label, 'r', encoding='utf-8') as f:
+                    label = [line.strip() for line in f.readlines() if line.strip()]
+            else:
+                label = None
+            corpus.append((campaign, name, image, label))
+    return corpus
+
+
+def view_to_text(view):
+    """
+    Args:
+        view (View):
+
+    Returns:
+        list[str]: Same as the output of `view.show()`
+    """
+    return [' '.join([view[(x, y)].str if (x, y) in view else '..' for x in range(view.shape[0] + 1)])
+            for y in range(view.shape[1] + 1)]
+
+
+def compare_text(result, label):
+    """
+    Args:
+        result (list[str]):
+        label (list[str]):
+
+    Returns:
+        int, int: Number of correct grids, number of grids in label.
+    """
+    label = [row.split() for row in label]
+    result = [row.split() for row in result]
+    total = sum([len(row) for row in label])
+    if [len(row) for row in label] != [len(row) for row in result]:
+        # Wrong map shape
+        return 0, total
+    correct = sum([a == b for row_a, row_b in zip(result, label) for a, b in zip(row_a, row_b)])
+    return correct, total
+
+
+def backend_config(backend):
+    """
+    Args:
+        backend (str): 'homography' or 'perspective'
+
+    Returns:
+        AzurLaneConfig:
+    """
+    config = AzurLaneConfig('template').merge(Config())
+    config.DETECTION_BACKEND = backend
+    return config
+
+
+def iter_views(config, corpus):
+    """
+    Homography and tracking state is kept within a campaign, like in a real run,
+    but doesn't leak between campaigns.
+
+    Yields:
+        View, str, str, np.ndarray, list[str]: view, campaign, name, image, label
+    """
+    view = None
+    prev = None
+    for campaign, name, image, label in corpus:
+        if campaign != prev:
+            view = View(config)
+            prev = campaign
+        yield view, campaign, name, image, label
+
+
+def benchmark(backend, corpus):
+    """
+    Args:
+        backend (str): 'homography' or 'perspective'
+        corpus (list):
+
+    Returns:
+        dict: Key: stage name, Value: list of time cost in seconds.
+        dict: Key: str, Value: int. Accuracy counters.
+    """
+    config = backend_config(backend)
+    stage_time = {}
+    accuracy = {'correct': 0, 'total': 0, 'images': 0, 'error': 0}
+
+    def record(name, cost):
+        stage_time.setdefault(name, []).append(cost)
+
+    for view, campaign, name, image, label in iter_views(config, corpus):
+        for n in range(REPEAT):
+            try:
+                start = time.perf_counter()
+                view.load(image)
+                record('load', time.perf_counter() - start)
+                start = time.perf_counter()
+                view.predict()
+                record('predict', time.perf_counter() - start)
+            except MapDetectionError as e:
+                logger.warning(f'{backend} {campaign}/{name}: {e}')
+                accuracy['error'] += 1
+                break
+
+            for stage, cost in view.predict_time.items():
+                record(f'predict.{stage}', cost)
+            for stage, cost in getattr(view.backend, 'stage_time', {}).items():
+                record(f'backend.{stage}', cost)
+        else:
+            result = view_to_text(view)
+            if LABEL and label is None and backend == BACKENDS[0]:
+                with open(os.path.join(FOLDER, campaign, f'{name}.txt'), 'w', encoding='utf-8') as f:
+                    f.write('\n'.join(result) + '\n')
+            if label is not None:
+                correct, total = compare_text(result, label)
+                accuracy['correct'] += correct
+                accuracy['total'] += total
+                accuracy['images'] += 1
+
+    return stage_time, accuracy
+
+
+def benchmark_memory(backend, corpus):
+    """
+    Run detection once on each screenshot with tracemalloc.
+    This is separated from timing, because tracing slows down everything.
+
+    Args:
+        backend (str): 'homography' or 'perspective'
+        corpus (list):
+
+    Returns:
+        int: Peak memory in bytes.
+    """
+    config = backend_config(backend)
+    tracemalloc.start()
+    for view, campaign, name, image, label in iter_views(config, corpus):
+        try:
+            view.load(image)
+            view.predict()
+        except MapDetectionError:
+            pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def show(backend, stage_time, accuracy, peak):
+    print(f'Backend: {backend}')
+    print(f'    {"stage":<28} {"count":>6} {"p50":>9} {"p90":>9} {"p99":>9} {"max":>9}')
+    for stage, cost in stage_time.items():
+        cost = np.array(cost) * 1000
+        p50, p90, p99 = np.percentile(cost, [50, 90, 99])
+        print(f'    {stage:<28} {len(cost):>6} {p50:>7.2f}ms {p90:>7.2f}ms {p99:>7.2f}ms {np.max(cost):>7.2f}ms')
+    print(f'    Peak memory: {peak / 1024 / 1024:.1f} MB')
+    print(f'    Detection errors: {accuracy["error"]}')
+    if accuracy['total']:
+        print(f'    Accuracy: {accuracy["correct"]}/{accuracy["total"]} grids '
+              f'({accuracy["correct"] / accuracy["total"] * 100:.2f}%) in {accuracy["images"]} labelled images')
+    else:
+        print('    Accuracy: no labelled images')
+
+
+if __name__ == '__main__':
+    # Detection logs are too noisy in benchmark
+    logger.setLevel(logging.WARNING)
+    corpus = load_corpus(FOLDER)
+    print(f'Loaded {len(corpus)} screenshots from {FOLDER}')
+    for backend in BACKENDS:
+        show(backend, *benchmark(backend, corpus), benchmark_memory(backend, corpus))
@@ -0,0 +1,99 @@
+import glob
+import json
+import os
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from module.base.utils import get_bbox, load_image
+from module.logger import logger
+from module.ocr.al_ocr import AlOcr
+from module.ocr.numpy_ocr import NumpyOcr
+
+"""
+This file records the outputs of mxnet OCR models (AlOcr),
+which tests/test_numpy_ocr.py compares NumpyOcr against.
+
+Usage:
+    - Install mxnet and cnocr, as in requirements.txt
+    - Run ocr_numpy_record.py
+    - Commit the files in ./tests/ocr_parity
+
+Output:
+    ./tests/ocr_parity/<index>.png: Grayscale text lines, cropped from OCR assets and rendered by opencv.
+    ./tests/ocr_parity/<model>.json: Results of `AlOcr.ocr_for_single_lines(confidence=True)` on these images.
+        Models without files in ./bin/cnocr_models are skipped.
+"""
+FOLDER = './tests/ocr_parity'
+# Same as module/ocr/models.py, model name: epoch
+MODELS = {
+    'azur_lane': 15,
+    'cnocr': 39,
+    'jp': 125,
+    'tw': 63,
+}
+TEXTS = ['0123456789', 'ABCDEFGHIJKLMN', 'PQRSTUVWXYZ', '12:34:56', '1/5', 'SP3-4', '100/100']
+
+
+def model_ready(name):
+    """
+    Returns:
+        bool: If all model files exist.
+    """
+    folder = f'./bin/cnocr_models/{name}'
+    prefix = f'{folder}/cnocr-v1.2.0-densenet-lite-gru'
+    return all([os.path.exists(file) for file in [
+        f'{folder}/label_cn.txt', f'{prefix}-symbol.json', f'{prefix}-{MODELS[name]:04d}.params']])
+
+
+def generate_images():
+    """
+    Returns:
+        list[np.ndarray]: Grayscale images.
+    """
+    images = []
+    for file in sorted(glob.glob('./assets/cn/*/OCR_*.png') + glob.glob('./assets/en/*/OCR_*.png')):
+        image = load_image(file)
+        bbox = get_bbox(image)
+        image = cv2.cvtColor(np.array(Image.fromarray(image).crop(bbox)), cv2.COLOR_RGB2GRAY)
+        if image.shape[0] < 10 or image.shape[1] < 10:
+            continue
+        images.append(image)
+
+    for index, text in enumerate(TEXTS):
+        font = [cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX, cv2.FONT_HERSHEY_TRIPLEX][index % 3]
+        image = np.full((40, 24 * len(text) + 20), 255, dtype=np.uint8)
+        cv2.putText(image, text, (8, 30), font, 1, 0, 2)
+        images.append(image)
+    return images
+
+
+def record():
+    os.makedirs(FOLDER, exist_ok=True)
+    images = generate_images()
+    for index, image in enumerate(images):
+        Image.fromarray(image).save(f'{FOLDER}/{index}.png')
+    logger.info(f'Saved {len(images)} images')
+
+    for name, epoch in MODELS.items():
+        if not model_ready(name):
+            logger.warning(f'Model files not found, skip: {name}')
+            continue
+        ocr = AlOcr(model_name='densenet-lite-gru', model_epoch=epoch, root=f'./bin/cnocr_models/{name}', name=name)
+        numpy_ocr = NumpyOcr(model_name='densenet-lite-gru', model_epoch=epoch,
+                             root=f'./bin/cnocr_models/{name}', name=name)
+        result = {}
+        for index, image in enumerate(images):
+            chars, probs, confidence = ocr.ocr_for_single_lines([image], confidence=True)[0]
+            result[str(index)] = [chars, probs, confidence]
+            # Compare now, so differences are found before commit.
+            if numpy_ocr.ocr_for_single_lines([image], confidence=True)[0][0] != chars:
+                logger.warning(f'NumpyOcr differs from AlOcr on model {name}, image {index}')
+        with open(f'{FOLDER}/{name}.json', 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=1)
+        logger.info(f'Recorded model: {name}')
+
+
+if __name__ == '__main__':
+    record()
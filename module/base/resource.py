@@ -124,19 +124,23 @@ def release_resources(next_task=''):
         obj.resource_release()
 
     # Release cached images for map detection
-    from module.map_detection.utils_assets import ASSETS
-    attr_list = [
-        'ui_mask',
-        'ui_mask_os',
-        'ui_mask_stroke',
-        'ui_mask_in_map',
-        'ui_mask_os_in_map',
-        'tile_center_image',
-        'tile_corner_image',
-        'tile_corner_image_list'
-    ]
-    for attr in attr_list:
-        del_cached_property(ASSETS, attr)
+    # They take a few MB, keep them on task switching,
+    # so UI masks don't need to be re-calculated when entering map again.
+    if not next_task:
+        from module.map_detection.utils_assets import ASSETS
+        attr_list = [
+            'ui_mask',
+            'ui_mask_os',
+            'ui_mask_stroke',
+            'ui_mask_in_map',
+            'ui_mask_os_in_map',
+            'ui_mask_homo_stroke_cache',
+            'tile_center_image',
+            'tile_corner_image',
+            'tile_corner_image_list'
+        ]
+        for attr in attr_list:
+            del_cached_property(ASSETS, attr)
 
     # Useless in most cases, but just call it
     # gc.collect()
@@ -2,12 +2,14 @@ import copy
 import importlib
 import os
 
+import module.config.server as server
 from module.campaign.assets import *
 from module.campaign.campaign_base import CampaignBase
 from module.config.config import AzurLaneConfig
 from module.config.utils import deep_get
 from module.exception import CampaignEnd, RequestHumanTakeover, ScriptEnd
 from module.logger import logger
+from module.map.map_catalogue import MapCatalogue
 from module.ocr.ocr import Digit
 from module.ui.ui import UI
 
@@ -48,6 +50,11 @@ class CampaignRun(UI):
             self.module = importlib.import_module('.' + name, f'campaign.{folder}')
         except ModuleNotFoundError:
             logger.warning(f'Map file not found: campaign.{folder}.{name}')
+            catalogue = MapCatalogue()
+            catalogue.ensure()
+            entries = catalogue.find(name=name, server=server.server)
+            if entries:
+                logger.warning(f'Same map file in other folders: {[entry["folder"] for entry in entries]}')
             folder = f'./campaign/{folder}'
             if not os.path.exists(folder):
                 logger.warning(f'Folder not exists: {folder}')
@@ -33,9 +33,7 @@ SHORTEST_FILTER = """
 
 
 class SuffixOcr(Ocr):
-    def pre_process(self, image):
-        image = super().pre_process(image)
-
+    def after_extract(self, image):
         left = np.where(np.min(image[5:-5, :], axis=0) < 85)[0]
         # Look back several pixels
         if server.server in ['jp']:
@@ -140,6 +140,20 @@ class ManualConfig:
     MAP_SWIPE_OPTIMIZE = True
     # Swipe after boss appear. Could avoid map detection error when camera is on edge.
     MAP_BOSS_APPEAR_REFOCUS_SWIPE = (0, 0)
+    # In full scan, skip camera positions whose sight are all scanned in previous views.
+    MAP_FULL_SCAN_SKIP_SCANNED = False
+    # Plan the order of battles before boss appears, instead of choosing the next enemy greedily.
+    # See module/map/map_planner.py
+    MAP_BATTLE_PLANNER = False
+    MAP_BATTLE_PLANNER_BEAM_WIDTH = 8
+    # Record spawn positions of each full scan to ./log/cache/spawn_prior.txt,
+    # and skip camera positions whose sight only have grids that almost never spawn anything at current battle count.
+    # Grids need at least MAP_SPAWN_PRIOR_MIN_SCAN scans at the same battle count to be judged,
+    # and grids with spawn probability lower than MAP_SPAWN_PRIOR_THRESHOLD are skipped.
+    # See module/map/map_spawn_prior.py
+    MAP_SPAWN_PRIOR = False
+    MAP_SPAWN_PRIOR_MIN_SCAN = 20
+    MAP_SPAWN_PRIOR_THRESHOLD = 0.02
 
     """
     module.map_detection
@@ -150,6 +164,9 @@ class ManualConfig:
     DETECTION_BACKEND = 'homography'
     # In event_20200723_cn B3D3, Grid have 1.2x width, images on the grid still remain the same.
     GRID_IMAGE_A_MULTIPLY = 1.0
+    # Predict all grids at once, instead of cropping and matching grid by grid.
+    # Grids with custom predict methods are still predicted one by one.
+    MAP_GRID_PREDICT_BATCH = True
 
     """
     module.map_detection.homography
@@ -168,6 +185,11 @@ class ManualConfig:
     HOMO_EDGE_DETECT = True
     HOMO_EDGE_HOUGHLINES_THRESHOLD = 140
     HOMO_EDGE_COLOR_RANGE = (0, 33)
+    # Search free tile around the previous match first, fallback to full search if failed.
+    # Tracking accepts the best match within HOMO_TRACKING_RADIUS pixels of the previous match instead of the global best,
+    # so homo_loca and map_inner follow the previous match as long as it's good and not on the window edge.
+    HOMO_TRACKING = False
+    HOMO_TRACKING_RADIUS = 20
     # ((x, y), [upper-left, upper-right, bottom-left, bottom-right])
     HOMO_STORAGE = None
 
@@ -200,11 +222,16 @@ class ManualConfig:
     # Parameters for perspective calculating
     VANISH_POINT_RANGE = ((540, 740), (-3000, -1000))
     DISTANCE_POINT_X_RANGE = ((-3200, -1600),)
+    # True to search vanish point and distant point by brute force in the ranges above,
+    # False to fit them from detected lines, which is much faster
+    VANISH_POINT_BRUTE_FORCE = False
     # Parameters for line cleansing
     COINCIDENT_POINT_ENCOURAGE_DISTANCE = 3
     ERROR_LINES_TOLERANCE = (-10, 10)
     MID_DIFF_RANGE_H = (129 - 3, 129 + 3)
     MID_DIFF_RANGE_V = (129 - 3, 129 + 3)
+    # Number of threads to run independent stages concurrently, 0 to run all stages sequentially
+    PERSPECTIVE_DETECTION_THREADS = 0
 
     """
     module.os
@@ -276,6 +303,24 @@ class ManualConfig:
     """
     OS_ACTION_POINT_BOX_USE = True
     OS_ACTION_POINT_PRESERVE = 0
+    # In meowfficer farming, visit zones in a planned route that minimizes globe travel,
+    # instead of visiting them clockwise.
+    OS_ZONE_ROUTE = False
+    # In map rescan, skip camera positions that were rescanned without map events in current zone,
+    # unless radar shows changes in their sight.
+    OS_MAP_RESCAN_CACHE = False
+    # Detect walk and camera stability by frame differencing on downsampled map area,
+    # instead of waiting homo_loca unchanged for a fixed time.
+    # Mean grayscale difference above OS_MOTION_MOVING is moving, below OS_MOTION_STILL is still,
+    # differences in between keep the previous state.
+    OS_MOTION_DETECTION = False
+    OS_MOTION_AREA = (234, 123, 998, 633)
+    OS_MOTION_RESIZE = 0.25
+    OS_MOTION_MOVING = 4.
+    OS_MOTION_STILL = 1.5
+    OS_MOTION_STILL_COUNT = 2
+    # Seconds for fleet to walk through a grid, used to predict arrival.
+    OS_WALK_GRID_TIME = 0.3
 
     """
     module.os.globe_detection
@@ -298,6 +343,12 @@ class ManualConfig:
         'distance': 35,
         'wlen': 500,
     }
+    # Globe map is searched coarsely on the whole globe in OS_GLOBE_COARSE_RESIZE, and refined at full size.
+    # Searching within OS_GLOBE_SEARCH_RADIUS pixels around the expected camera is taken only if it beats the coarse result.
+    # Results with similarity lower than OS_GLOBE_SEARCH_SIMILARITY fallback to full search.
+    OS_GLOBE_SEARCH_RADIUS = 100
+    OS_GLOBE_SEARCH_SIMILARITY = 0.2
+    OS_GLOBE_COARSE_RESIZE = 0.25
 
     """
     module.retire
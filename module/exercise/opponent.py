@@ -17,8 +17,7 @@ PWR_FACTOR = 100
 
 
 class Level(Digit):
-    def pre_process(self, image):
-        image = super().pre_process(image)
+    def after_extract(self, image):
         letter_l = np.where(np.mean(image, axis=0) < 85)[0]
         if len(letter_l):
             letter_l = letter_l[0] + 22
@@ -2,6 +2,8 @@ import copy
 
 import numpy as np
 
+import module.config.server as server
+from module.base.decorator import cached_property
 from module.base.timer import Timer
 from module.base.utils import area_offset
 from module.combat.assets import GET_ITEMS_1
@@ -10,6 +12,7 @@ from module.handler.assets import AUTO_SEARCH_MENU_CONTINUE, GAME_TIPS
 from module.logger import logger
 from module.map.map_base import CampaignMap, location2node
 from module.map.map_operation import MapOperation
+from module.map.map_spawn_prior import SpawnPrior
 from module.map.utils import location_ensure, random_direction
 from module.map_detection.grid import Grid
 from module.map_detection.utils import area2corner, trapezoid2area
@@ -218,7 +221,8 @@ class Camera(MapOperation):
                     continue
 
     def predict(self):
-        self.view.predict()
+        # Reuse fleet predictions in predict_swipe()
+        self.view.predict(cached=True)
         self.view.show()
 
     def show_camera(self):
@@ -310,6 +314,14 @@ class Camera(MapOperation):
         if must_scan:
             queue = queue.add(must_scan)
 
+        # Global locations of grids that have been scanned
+        scanned = set()
+        # Global locations of grids that almost never spawn anything
+        rare = None
+        if self.config.MAP_SPAWN_PRIOR and mode == 'normal':
+            rare = self.spawn_prior.rare_locations(
+                self.map, battle_count=battle_count, min_scan=self.config.MAP_SPAWN_PRIOR_MIN_SCAN,
+                threshold=self.config.MAP_SPAWN_PRIOR_THRESHOLD)
         while len(queue) > 0:
             if self.map.missing_is_none(battle_count, mystery_count, siren_count, carrier_count, mode):
                 if must_scan and queue.count != queue.delete(must_scan).count:
@@ -328,10 +340,59 @@ class Camera(MapOperation):
                 continue
 
             queue = queue[1:]
-
+            scanned.update(self.view_global_locations())
+            if self.config.MAP_FULL_SCAN_SKIP_SCANNED:
+                remain = queue.filter(lambda grid: not self.is_sight_scanned(grid.location, scanned))
+                if remain.count < queue.count:
+                    logger.info(f'Skip scanned: {queue.delete(remain)}')
+                    queue = remain
+            if rare is not None:
+                # Grids that rarely spawn are treated as scanned, but must_scan grids are still scanned.
+                skip = scanned | rare
+                remain = queue.filter(lambda grid: (must_scan and grid in must_scan)
+                                                   or not self.is_sight_scanned(grid.location, skip))
+                if remain.count < queue.count:
+                    logger.info(f'Skip rare spawn: {queue.delete(remain)}')
+                    queue = remain
+
+        if self.config.MAP_SPAWN_PRIOR and mode == 'normal':
+            self.spawn_prior.record(self.map, battle_count=battle_count, scanned=scanned)
         self.map.missing_predict(battle_count, mystery_count, siren_count, carrier_count, mode)
         self.map.show()
 
+    @cached_property
+    def spawn_prior(self):
+        """
+        Returns:
+            SpawnPrior: Spawn statistics of current map file.
+        """
+        return SpawnPrior(server=server.server, map_name=self.__class__.__module__)
+
+    def view_global_locations(self):
+        """
+        Returns:
+            set[tuple]: Global locations of grids in current view.
+        """
+        offset = np.array(self.camera) - self.view.center_loca
+        locations = [tuple(np.add(grid.location, offset).tolist()) for grid in self.view]
+        return set(loca for loca in locations if loca in self.map)
+
+    def is_sight_scanned(self, location, scanned):
+        """
+        Args:
+            location (tuple): Camera location.
+            scanned (set[tuple]): Global locations of scanned grids.
+
+        Returns:
+            bool: If all grids in camera sight are scanned, which means focusing camera there is unnecessary.
+        """
+        x1, y1, x2, y2 = area_offset(self.map.camera_sight, offset=location)
+        for x in range(x1, x2 + 1):
+            for y in range(y1, y2 + 1):
+                if (x, y) in self.map and (x, y) not in scanned:
+                    return False
+        return True
+
     def in_sight(self, location, sight=None):
         """Make sure location in camera sight
 
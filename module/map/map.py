@@ -6,6 +6,7 @@ from module.exception import MapEnemyMoved
 from module.logger import logger
 from module.map.fleet import Fleet
 from module.map.map_grids import RoadGrids, SelectedGrids
+from module.map.map_planner import BattlePlanner
 from module.map_detection.grid_info import GridInfo
 
 ENEMY_FILTER = Filter(regex=re.compile('^(.*?)$'), attr=('str',))
@@ -152,6 +153,47 @@ class Map(Fleet):
 
         return grids
 
+    def battle_plan_first(self, grids):
+        """
+        Move the first enemy of the best battle plan to the front.
+        Do nothing if MAP_BATTLE_PLANNER disabled or no plan found.
+
+        Args:
+            grids (SelectedGrids): Enemies selected by `select_grids()`.
+
+        Returns:
+            SelectedGrids:
+        """
+        if not self.config.MAP_BATTLE_PLANNER or not grids:
+            return grids
+
+        # Battles left before boss appears
+        battle = 0
+        for data in self.map.spawn_data:
+            if data.get('boss', 0):
+                battle = data.get('battle', 0) - self.battle_count
+                break
+        if battle <= 0:
+            return grids
+
+        targets = self.map.select(is_boss=True)
+        if not targets:
+            targets = self.map.select(may_boss=True)
+        planner = BattlePlanner(self.map, has_ambush=self.config.MAP_HAS_AMBUSH,
+                                beam_width=self.config.MAP_BATTLE_PLANNER_BEAM_WIDTH)
+        plan = planner.plan(
+            start=self.fleet_current,
+            enemies=self.map.select(is_enemy=True, is_boss=False).location,
+            targets=targets.location,
+            battle=battle
+        )
+        logger.info(f'Battle plan: {[self.map[location] for location in plan]}')
+        if plan and plan[0] in grids.location:
+            first = self.map[plan[0]]
+            grids = SelectedGrids([first] + [grid for grid in grids if grid != first])
+
+        return grids
+
     @staticmethod
     def show_select_grids(grids, **kwargs):
         length = 3
@@ -199,6 +241,7 @@ class Map(Fleet):
         elif self.config.MAP_CLEAR_ALL_THIS_TIME:
             kwargs['strongest'] = True
         grids = self.select_grids(grids, **kwargs)
+        grids = self.battle_plan_first(grids)
 
         if grids:
             logger.hr('Clear enemy')
@@ -1,4 +1,6 @@
 import copy
+import heapq
+import operator
 
 from module.base.utils import location2node, node2location
 from module.logger import logger
@@ -34,6 +36,9 @@ class CampaignMap:
         self.poor_map_data = False
         self.camera_sight = (-3, -1, 3, 2)
         self.grid_connection = {}
+        # Key: (location, ambush_cost, has_enemy), Value: (cost, connection) of find_path_initial()
+        self._path_cache = {}
+        self._path_cache_state = None
 
     def __iter__(self):
         return iter(self.grids.values())
@@ -297,6 +302,7 @@ class CampaignMap:
                 self[start].is_portal = False
                 self[start].portal_link = None
 
+        self._path_cache = {}
         return True
 
     def show(self):
@@ -517,39 +523,65 @@ class CampaignMap:
         """
         location = location_ensure(location)
         ambush_cost = 10 if has_ambush else 1
-        for grid in self:
-            grid.cost = 9999
-            grid.connection = None
-        start = self[location]
-        start.cost = 0
-        visited = [start]
-        visited = set(visited)
 
-        while 1:
-            new = visited.copy()
-            for grid in visited:
-                for arr in self.grid_connection[grid.location]:
-                    arr = self[arr]
-                    if arr.is_land or arr.is_mechanism_block:
-                        continue
-                    cost = ambush_cost if arr.may_ambush else 1
-                    cost += grid.cost
-
-                    if cost < arr.cost:
-                        arr.cost = cost
-                        arr.connection = grid.location
-                    elif cost == arr.cost:
-                        if abs(arr.location[0] - grid.location[0]) == 1:
-                            arr.connection = grid.location
-                    if arr.is_sea or not has_enemy:
-                        new.add(arr)
-            if len(new) == len(visited):
-                break
-            visited = new
+        # Results are cached until grids that affect path finding change.
+        state = tuple((grid.is_land or grid.is_mechanism_block, grid.may_ambush, grid.is_sea) for grid in self)
+        if state != self._path_cache_state:
+            self._path_cache = {}
+            self._path_cache_state = state
+        key = (location, ambush_cost, has_enemy)
+        if key not in self._path_cache:
+            self._path_cache[key] = self._find_path_dijkstra(location, ambush_cost=ambush_cost, has_enemy=has_enemy)
+        cost, connection = self._path_cache[key]
+
+        for grid in self:
+            grid.cost = cost.get(grid.location, 9999)
+            grid.connection = connection.get(grid.location, None)
 
         # self.show_cost()
         # self.show_connection()
 
+    def _find_path_dijkstra(self, location, ambush_cost, has_enemy):
+        """
+        Args:
+            location (tuple(int)): Grid location
+            ambush_cost (int): Cost to pass a grid that may have ambush.
+            has_enemy (bool): False if only sea and land are considered
+
+        Returns:
+            dict: Key: location, Value: cost from start. Unreachable grids are not included.
+            dict: Key: location, Value: location of the previous grid in path.
+        """
+        cost = {location: 0}
+        connection = {}
+        visited = set()
+        queue = [(0, location)]
+        while queue:
+            grid_cost, loca = heapq.heappop(queue)
+            if loca in visited:
+                continue
+            visited.add(loca)
+            # Fleets can reach enemies but can't pass through them
+            grid = self[loca]
+            if loca != location and not (grid.is_sea or not has_enemy):
+                continue
+
+            for arr in self.grid_connection[loca]:
+                arr_grid = self[arr]
+                if arr_grid.is_land or arr_grid.is_mechanism_block:
+                    continue
+                arr_cost = grid_cost + (ambush_cost if arr_grid.may_ambush else 1)
+                if arr_cost < cost.get(arr, 9999):
+                    cost[arr] = arr_cost
+                    connection[arr] = loca
+                    heapq.heappush(queue, (arr_cost, arr))
+                elif arr_cost == cost[arr]:
+                    # Prefer horizontal moves
+                    if abs(arr[0] - loca[0]) == 1:
+                        connection[arr] = loca
+
+        return cost, connection
+
     def find_path_initial_multi_fleet(self, location_dict, current, has_ambush):
         """
         Args:
@@ -772,16 +804,14 @@ class CampaignMap:
         Returns:
             SelectedGrids:
         """
-        result = []
-        for grid in self:
-            flag = True
-            for k, v in kwargs.items():
-                if grid.__getattribute__(k) != v:
-                    flag = False
-            if flag:
-                result.append(grid)
-
-        return SelectedGrids(result)
+        if not kwargs:
+            return SelectedGrids(list(self))
+        # Get all attributes at once and compare as tuple.
+        getter = operator.attrgetter(*kwargs.keys())
+        values = tuple(kwargs.values())
+        if len(values) == 1:
+            values = values[0]
+        return SelectedGrids([grid for grid in self if getter(grid) == values])
 
     def to_selected(self, grids):
         """
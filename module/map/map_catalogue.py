@@ -0,0 +1,264 @@
+import ast
+import os
+import pickle
+import re
+
+from module.base.decorator import cached_property
+from module.logger import logger
+from module.map.map_base import CampaignMap
+
+"""
+Catalogue of all campaign maps under ./campaign.
+
+Map files define MAP with literal data, such as `MAP.shape = 'H5'`, but importing them also
+imports the whole campaign logic. The catalogue reads MAP settings from the source code with `ast`,
+stores them in a pickle file, and materialises a CampaignMap only when needed.
+Tools that scan all maps can read the catalogue without importing ~700 modules.
+CampaignRun.load_campaign() searches the catalogue for the map in other folders, if the map file is not found.
+
+Build the catalogue:
+    python -m module.map.map_catalogue
+Entries of modified map files are re-parsed on access, so an outdated catalogue is still correct, just slower.
+"""
+CATALOGUE_FILE = './campaign/map_catalogue.pkl'
+CATALOGUE_VERSION = 1
+CAMPAIGN_FOLDER = './campaign'
+SERVERS = ['cn', 'en', 'jp', 'tw']
+
+
+class _GridNameToNode(ast.NodeTransformer):
+    """
+    Map files may refer grids by the variables from `MAP.flatten()`, such as `MAP.fortress_data = [D5, (C5, E5)]`.
+    Replace them with node names, so data can be evaluated as literal.
+    """
+
+    def visit_Name(self, node):
+        if re.match(r'^[A-Z]+[0-9]+$', node.id):
+            return ast.copy_location(ast.Constant(value=node.id), node)
+        return node
+
+
+def parse_map_file(file):
+    """
+    Read MAP settings from a map file without importing it.
+
+    Args:
+        file (str): Path to map file, such as ./campaign/campaign_main/campaign_7_2.py
+
+    Returns:
+        dict: {'map_name': str, 'attrs': list[tuple[str, Any]]},
+            attrs are in the same order as the map file, because setters depend on each other.
+            None if file doesn't define MAP.
+    """
+    with open(file, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=file)
+
+    map_name = None
+    defined = False
+    attrs = []
+    for node in tree.body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+            continue
+        target = node.targets[0]
+        # MAP = CampaignMap('7-2')
+        if isinstance(target, ast.Name) and target.id == 'MAP':
+            if isinstance(node.value, ast.Call) and getattr(node.value.func, 'id', None) == 'CampaignMap':
+                args = [ast.literal_eval(arg) for arg in node.value.args]
+                map_name = args[0] if args else None
+                defined = True
+        # MAP.shape = 'H5'
+        elif isinstance(target, ast.Attribute) and getattr(target.value, 'id', None) == 'MAP':
+            try:
+                attrs.append((target.attr, ast.literal_eval(_GridNameToNode().visit(node.value))))
+            except ValueError:
+                logger.warning(f'Non-literal map data is not catalogued: {file} MAP.{target.attr}')
+
+    if not defined:
+        return None
+    return {'map_name': map_name, 'attrs': attrs}
+
+
+def entry_to_map(entry):
+    """
+    Args:
+        entry (dict): Catalogue entry.
+
+    Returns:
+        CampaignMap: Same as the MAP defined in map file.
+    """
+    map_ = CampaignMap(entry['map_name'])
+    for attr, value in entry['attrs']:
+        setattr(map_, attr, value)
+    return map_
+
+
+class MapCatalogue:
+    def __init__(self, file=CATALOGUE_FILE, folder=CAMPAIGN_FOLDER):
+        """
+        Args:
+            file (str): Catalogue file.
+            folder (str): Campaign folder.
+        """
+        self.file = file
+        self.folder = folder
+
+    @staticmethod
+    def folder_server(folder):
+        """
+        Args:
+            folder (str): Such as event_20200227_cn, campaign_main
+
+        Returns:
+            str: Server of the folder, None if folder is shared by all servers.
+        """
+        server = folder.rsplit('_', 1)[-1]
+        return server if server in SERVERS else None
+
+    def parse_entry(self, folder, name):
+        """
+        Args:
+            folder (str): Name of the file folder under campaign.
+            name (str): Name of .py file.
+
+        Returns:
+            dict: Catalogue entry, None if not a map file.
+        """
+        file = os.path.join(self.folder, folder, f'{name}.py')
+        data = parse_map_file(file)
+        if data is None:
+            return None
+
+        data.update({
+            'folder': folder,
+            'name': name,
+            'server': self.folder_server(folder),
+            'mtime': os.stat(file).st_mtime,
+        })
+        return data
+
+    @cached_property
+    def entries(self):
+        """
+        Returns:
+            dict: Key: (folder, name), Value: catalogue entry.
+        """
+        if not os.path.exists(self.file):
+            logger.info(f'Map catalogue not found: {self.file}')
+            return {}
+        with open(self.file, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('version') != CATALOGUE_VERSION:
+            logger.info('Map catalogue outdated')
+            return {}
+        return data['entries']
+
+    @cached_property
+    def index(self):
+        """
+        Returns:
+            dict: Key: file name, Value: list of (folder, name).
+        """
+        index = {}
+        for key in self.entries.keys():
+            index.setdefault(key[1], []).append(key)
+        return index
+
+    def build(self):
+        """
+        Parse all map files and save the catalogue.
+
+        Returns:
+            int: Number of maps.
+        """
+        logger.hr('Build map catalogue', level=1)
+        entries = {}
+        for folder in sorted(os.listdir(self.folder)):
+            if not os.path.isdir(os.path.join(self.folder, folder)):
+                continue
+            for file in sorted(os.listdir(os.path.join(self.folder, folder))):
+                name, ext = os.path.splitext(file)
+                if ext != '.py' or name.startswith('_'):
+                    continue
+                entry = self.parse_entry(folder, name)
+                if entry is not None:
+                    entries[(folder, name)] = entry
+
+        with open(self.file, 'wb') as f:
+            pickle.dump({'version': CATALOGUE_VERSION, 'entries': entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.info(f'Saved {len(entries)} maps to {self.file}')
+        self.__dict__['entries'] = entries
+        self.__dict__.pop('index', None)
+        return len(entries)
+
+    def get(self, folder, name):
+        """
+        Args:
+            folder (str): Name of the file folder under campaign.
+            name (str): Name of .py file.
+
+        Returns:
+            dict: Catalogue entry, None if map file not exists.
+        """
+        key = (folder, name)
+        file = os.path.join(self.folder, folder, f'{name}.py')
+        if not os.path.exists(file):
+            return None
+
+        entry = self.entries.get(key)
+        if entry is None or entry['mtime'] != os.stat(file).st_mtime:
+            entry = self.parse_entry(folder, name)
+            if entry is None:
+                return None
+            if key not in self.entries:
+                self.index.setdefault(name, []).append(key)
+            self.entries[key] = entry
+        return entry
+
+    def find(self, name=None, server=None, folder=None):
+        """
+        Args:
+            name (str): Name of .py file, such as campaign_7_2
+            server (str): Maps of this server and maps shared by all servers.
+            folder (str): Name of the file folder under campaign.
+
+        Returns:
+            list[dict]: Catalogue entries.
+        """
+        keys = self.index.get(name, []) if name is not None else self.entries.keys()
+        out = []
+        for key in keys:
+            entry = self.entries[key]
+            if folder is not None and entry['folder'] != folder:
+                continue
+            if server is not None and entry['server'] not in (server, None):
+                continue
+            out.append(entry)
+        return out
+
+    def load_map(self, folder, name):
+        """
+        Args:
+            folder (str): Name of the file folder under campaign.
+            name (str): Name of .py file.
+
+        Returns:
+            CampaignMap: None if map file not exists.
+        """
+        entry = self.get(folder, name)
+        if entry is None:
+            return None
+        return entry_to_map(entry)
+
+    def ensure(self):
+        """
+        Build the catalogue if it doesn't exist or is outdated.
+        """
+        if not self.entries:
+            self.build()
+
+
+if __name__ == '__main__':
+    # Ensure running in Alas root folder
+    os.chdir(os.path.join(os.path.dirname(__file__), '../../'))
+
+    MapCatalogue().build()
@@ -1,5 +1,8 @@
 import operator
 
+from module.base.decorator import cached_property
+from module.map_detection.grid_info import GridInfo
+
 
 class SelectedGrids:
     def __init__(self, grids):
@@ -15,7 +18,11 @@ class SelectedGrids:
             return SelectedGrids(self.grids[item])
 
     def __contains__(self, item):
-        return item in self.grids
+        if isinstance(item, GridInfo):
+            # Grids are equal if they have the same location, so hash lookup gives the same result.
+            return item.location in self.location_set
+        else:
+            return item in self.grids
 
     def __str__(self):
         # return str([str(grid) for grid in self])
@@ -38,6 +45,16 @@ class SelectedGrids:
         """
         return [grid.location for grid in self.grids]
 
+    @cached_property
+    def location_set(self):
+        """
+        Grids in SelectedGrids are not modified after creation, so it's safe to cache.
+
+        Returns:
+            set[tuple]: Locations of GridInfo objects.
+        """
+        return set(grid.location for grid in self.grids if isinstance(grid, GridInfo))
+
     @property
     def cost(self):
         """
@@ -70,17 +87,18 @@ class SelectedGrids:
         Returns:
             SelectedGrids:
         """
-        result = []
-        for grid in self:
-            flag = True
-            for k, v in kwargs.items():
-                grid_v = grid.__getattribute__(k)
-                if type(grid_v) != type(v) or grid_v != v:
-                    flag = False
-            if flag:
-                result.append(grid)
-
-        return SelectedGrids(result)
+        if not kwargs:
+            return SelectedGrids(list(self.grids))
+        # Get all attributes at once and compare as tuple, types are compared only if values equal.
+        getter = operator.attrgetter(*kwargs.keys())
+        values = tuple(kwargs.values())
+        types = tuple(type(v) for v in values)
+        if len(values) == 1:
+            value, value_type = values[0], types[0]
+            return SelectedGrids([grid for grid in self if getter(grid) == value and type(getter(grid)) == value_type])
+        else:
+            return SelectedGrids([grid for grid in self if getter(grid) == values
+                                  and tuple(type(v) for v in getter(grid)) == types])
 
     def filter(self, func):
         """
@@ -150,8 +168,16 @@ class SelectedGrids:
         Returns:
             SelectedGrids:
         """
+        total = list(self.grids) + list(grids.grids)
+        if all(isinstance(grid, GridInfo) for grid in total):
+            # Grids are equal if they have the same location, de-duplicate by location in linear time.
+            new = {}
+            for grid in total:
+                new.setdefault(grid.location, grid)
+            return SelectedGrids(list(new.values()))
+
         new = []
-        for grid in self.grids + grids.grids:
+        for grid in total:
             if grid not in new:
                 new.append(grid)
 
@@ -177,12 +203,7 @@ class SelectedGrids:
         Returns:
             SelectedGrids:
         """
-        new = []
-        for grid in self.grids:
-            if grid in grids.grids:
-                new.append(grid)
-
-        return SelectedGrids(new)
+        return SelectedGrids([grid for grid in self.grids if grid in grids])
 
     def delete(self, grids):
         """
@@ -192,6 +213,8 @@ class SelectedGrids:
         Returns:
             SelectedGrids:
         """
+        if not isinstance(grids, SelectedGrids):
+            grids = SelectedGrids(list(grids))
         g = [grid for grid in self.grids if grid not in grids]
         return SelectedGrids(g)
 
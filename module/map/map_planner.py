@@ -0,0 +1,112 @@
+import heapq
+
+from module.map.map_base import CampaignMap
+
+
+class BattlePlanner:
+    """
+    Plan the order of battles before boss appears.
+
+    Greedy selection picks the best enemy for the next battle only. This planner runs a beam search over
+    sequences of enemies, fleet moves to each enemy and stands there after the battle,
+    cleared enemies become sea and can be passed through. After the planned battles, fleet needs to reach
+    one of the targets. Plans are scored by total path cost, so ambush grids are avoided as well.
+
+    Enemies spawn after battles and boss may move, so only the first step of a plan should be trusted.
+    Re-plan after each battle.
+    """
+
+    def __init__(self, map_, has_ambush=True, beam_width=8):
+        """
+        Args:
+            map_ (CampaignMap):
+            has_ambush (bool): MAP_HAS_AMBUSH
+            beam_width (int): Number of partial plans to keep in each step.
+        """
+        self.connection = map_.grid_connection
+        self.ambush_cost = 10 if has_ambush else 1
+        self.beam_width = beam_width
+        # Snapshot of current map
+        self.blocked = set(grid.location for grid in map_ if grid.is_land or grid.is_mechanism_block)
+        self.ambush = set(grid.location for grid in map_ if grid.may_ambush)
+        self.sea = set(grid.location for grid in map_ if grid.is_sea)
+        self._cost_cache = {}
+
+    def cost_from(self, start, cleared):
+        """
+        Same rules as CampaignMap.find_path_initial(), but with cleared enemies.
+
+        Args:
+            start (tuple): Grid location.
+            cleared (frozenset[tuple]): Locations of enemies that are cleared in plan.
+
+        Returns:
+            dict: Key: location, Value: cost from start. Unreachable grids are not included.
+        """
+        key = (start, cleared)
+        if key in self._cost_cache:
+            return self._cost_cache[key]
+
+        cost = {start: 0}
+        visited = set()
+        queue = [(0, start)]
+        while queue:
+            grid_cost, loca = heapq.heappop(queue)
+            if loca in visited:
+                continue
+            visited.add(loca)
+            if loca != start and loca not in self.sea and loca not in cleared:
+                continue
+
+            for arr in self.connection[loca]:
+                if arr in self.blocked:
+                    continue
+                arr_cost = grid_cost + (self.ambush_cost if arr in self.ambush else 1)
+                if arr_cost < cost.get(arr, 9999):
+                    cost[arr] = arr_cost
+                    heapq.heappush(queue, (arr_cost, arr))
+
+        self._cost_cache[key] = cost
+        return cost
+
+    def plan(self, start, enemies, targets, battle):
+        """
+        Args:
+            start (tuple): Fleet location.
+            enemies (list[tuple]): Locations of enemies that can be cleared.
+            targets (list[tuple]): Locations that fleet should reach after battles, such as boss spawn points.
+            battle (int): Number of battles before targets.
+
+        Returns:
+            list[tuple]: Locations of enemies to clear in order.
+                Empty list if unable to reach any target after the battles.
+        """
+        # (total_cost, location, cleared, sequence)
+        beam = [(0, start, frozenset(), ())]
+        for _ in range(battle):
+            candidates = {}
+            for total, loca, cleared, sequence in beam:
+                cost = self.cost_from(loca, cleared)
+                for enemy in enemies:
+                    if enemy in cleared or enemy not in cost:
+                        continue
+                    state = (enemy, cleared | {enemy})
+                    new = (total + cost[enemy], enemy, state[1], sequence + (enemy,))
+                    # Same fleet location and same cleared enemies, keep the cheaper one
+                    if state not in candidates or new[0] < candidates[state][0]:
+                        candidates[state] = new
+            if not candidates:
+                return []
+            beam = sorted(candidates.values(), key=lambda x: (x[0], x[3]))[:self.beam_width]
+
+        result = []
+        for total, loca, cleared, sequence in beam:
+            cost = self.cost_from(loca, cleared)
+            reach = [cost[target] for target in targets if target in cost]
+            if reach:
+                result.append((total + min(reach), sequence))
+        if not result:
+            return []
+
+        _, sequence = min(result)
+        return list(sequence)
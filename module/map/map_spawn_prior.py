@@ -0,0 +1,163 @@
+import os
+
+from module.base.utils import location2node, node2location
+from module.logger import logger
+
+SPAWN_PRIOR_FILE = './log/cache/spawn_prior.txt'
+# Records of each map are compacted to the latest SPAWN_PRIOR_MAX_RECORDS,
+# when there are 25% more than that.
+SPAWN_PRIOR_MAX_RECORDS = 500
+
+
+class SpawnPrior:
+    """
+    Spawn positions observed in previous full scans of a map, kept across runs.
+
+    Each full scan appends one line to a file, fields are separated by tab:
+        <server> <map> <battle_count> <found> <unscanned>
+    found is a list of grid and its code, unscanned is a list of grids that are not in sight during the scan.
+    Such as `cn  campaign.campaign_main.campaign_7_2  0  A1:3E,D3:2E,E3:MY  H5,H4`
+
+    Spawns are different before and after battles, so statistics are conditioned on battle_count.
+    """
+
+    def __init__(self, server, map_name, file=SPAWN_PRIOR_FILE, max_records=SPAWN_PRIOR_MAX_RECORDS):
+        """
+        Args:
+            server (str): Such as 'cn'.
+            map_name (str): Module name of map file, such as campaign.campaign_main.campaign_7_2
+            file (str):
+            max_records (int): Number of latest records to keep for this map.
+        """
+        self.server = server
+        self.map_name = map_name
+        self.file = file
+        self.max_records = max_records
+        # List of (battle_count, found, unscanned), found and unscanned are sets of locations.
+        self.records = []
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.file):
+            return
+        with open(self.file, 'r', encoding='utf-8') as f:
+            for line in f:
+                row = line.rstrip('\n').split('\t')
+                if len(row) != 5 or row[0] != self.server or row[1] != self.map_name:
+                    continue
+                found = set([node2location(item.split(':')[0]) for item in row[3].split(',') if item])
+                unscanned = set([node2location(node) for node in row[4].split(',') if node])
+                self.records.append((int(row[2]), found, unscanned))
+        logger.info(f'Spawn prior: {len(self.records)} scans of {self.map_name}')
+
+    def compact(self):
+        """
+        Keep the latest `max_records` records of this map in file, records of other maps are untouched.
+        """
+        lines = []
+        count = 0
+        with open(self.file, 'r', encoding='utf-8') as f:
+            for line in f:
+                row = line.split('\t')
+                is_current = len(row) == 5 and row[0] == self.server and row[1] == self.map_name
+                count += is_current
+                lines.append((is_current, line))
+        drop = count - self.max_records
+        with open(self.file, 'w', encoding='utf-8') as f:
+            for is_current, line in lines:
+                if is_current and drop > 0:
+                    drop -= 1
+                    continue
+                f.write(line)
+        self.records = self.records[-self.max_records:]
+        logger.info(f'Spawn prior compacted: {count} -> {len(self.records)} scans of {self.map_name}')
+
+    def record(self, map_, battle_count, scanned):
+        """
+        Args:
+            map_ (CampaignMap): Map after full scan.
+            battle_count (int):
+            scanned (set[tuple]): Locations of grids that were in sight.
+        """
+        grids = map_.select(is_enemy=True) \
+            .add(map_.select(is_siren=True)) \
+            .add(map_.select(is_boss=True)) \
+            .add(map_.select(is_mystery=True))
+        # Grids out of sight may keep the results of previous scans
+        grids = [grid for grid in grids if grid.location in scanned]
+        found = set([grid.location for grid in grids])
+        unscanned = set([grid.location for grid in map_ if grid.location not in scanned])
+        self.records.append((battle_count, found, unscanned))
+
+        found = ','.join([f'{location2node(grid.location)}:{grid.str}' for grid in grids])
+        unscanned = ','.join([location2node(loca) for loca in sorted(unscanned)])
+        folder = os.path.dirname(self.file)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(self.file, 'a', encoding='utf-8') as f:
+            f.write(f'{self.server}\t{self.map_name}\t{battle_count}\t{found}\t{unscanned}\n')
+
+        if len(self.records) > self.max_records * 1.25:
+            self.compact()
+
+    def statistics(self, battle_count):
+        """
+        Args:
+            battle_count (int):
+
+        Returns:
+            int: Number of scans.
+            dict: Key: location, Value: number of scans that found something at location.
+            dict: Key: location, Value: number of scans that didn't have location in sight.
+        """
+        scans = 0
+        found = {}
+        unscanned = {}
+        for count, record_found, record_unscanned in self.records[-self.max_records:]:
+            if count != battle_count:
+                continue
+            scans += 1
+            for loca in record_found:
+                found[loca] = found.get(loca, 0) + 1
+            for loca in record_unscanned:
+                unscanned[loca] = unscanned.get(loca, 0) + 1
+        return scans, found, unscanned
+
+    def probability(self, location, battle_count):
+        """
+        Args:
+            location (tuple):
+            battle_count (int):
+
+        Returns:
+            float: Probability of finding something at location in a full scan, None if not enough data.
+        """
+        scans, found, unscanned = self.statistics(battle_count)
+        observed = scans - unscanned.get(location, 0)
+        if observed <= 0:
+            return None
+        return found.get(location, 0) / observed
+
+    def rare_locations(self, map_, battle_count, min_scan, threshold):
+        """
+        Args:
+            map_ (CampaignMap):
+            battle_count (int):
+            min_scan (int): Minimum number of scans that have location in sight, at the same battle_count.
+            threshold (float):
+
+        Returns:
+            set[tuple]: Locations that almost never spawn anything.
+        """
+        scans, found, unscanned = self.statistics(battle_count)
+        rare = set()
+        for grid in map_:
+            if grid.is_land:
+                rare.add(grid.location)
+                continue
+            observed = scans - unscanned.get(grid.location, 0)
+            if observed < min_scan:
+                continue
+            if found.get(grid.location, 0) / observed < threshold:
+                rare.add(grid.location)
+        return rare
@@ -19,6 +19,10 @@ class Grid(GridInfo, GridPredictor):
         self.location = location
         super().__init__(location, image, corner, config)
 
+    def reset(self):
+        super().reset()
+        self.predicted = set()
+
     @cached_property
     def inner(self):
         """
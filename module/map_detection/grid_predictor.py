@@ -1,3 +1,6 @@
+import time
+from functools import lru_cache
+
 from module.base.utils import *
 from module.config.config import AzurLaneConfig
 from module.exception import ScriptError
@@ -7,7 +10,78 @@ from module.map_detection.utils_assets import *
 from module.template.assets import *
 
 
+@lru_cache(maxsize=4096)
+def grid_geometry(corner, tile, multiply):
+    """
+    Grid corners are the same when camera stays or moves in whole tiles,
+    so transforms of each grid are cached instead of calculating them on every View.load().
+
+    Args:
+        corner (tuple[float]): (x0, y0, x1, y1, x2, y2, x3, y3), [upper-left, upper-right, bottom-left, bottom-right]
+        tile (tuple[int]): HOMO_TILE
+        multiply (float): GRID_IMAGE_A_MULTIPLY
+
+    Returns:
+        tuple: _image_center, _image_a, area, homo_data, homo_invt.
+            Arrays are shared between grids, don't modify them.
+    """
+    # Calculate directly is faster than calling existing functions.
+    x0, y0, x1, y1, x2, y2, x3, y3 = corner
+    divisor = x0 - x1 + x2 - x3
+    x = (x0 * x2 - x1 * x3) / divisor
+    y = (x0 * y2 - x1 * y2 + x2 * y0 - x3 * y0) / divisor
+    center = np.array([x, y, x, y])
+    a = (-x0 * x2 + x0 * x3 + x1 * x2 - x1 * x3) / divisor * multiply
+
+    corner = np.array(corner).reshape(4, 2)
+    area = corner2area(corner)
+    homo_data = cv2.getPerspectiveTransform(
+        src=corner.astype(np.float32),
+        dst=area2corner((0, 0, *tile)).astype(np.float32))
+    homo_invt = cv2.invert(homo_data)[1]
+    return center, a, area, homo_data, homo_invt
+
+
+@lru_cache(maxsize=32)
+def enemy_genre_templates(enemy, siren):
+    """
+    Args:
+        enemy (tuple[str]): MAP_ENEMY_TEMPLATE
+        siren (tuple[str]): MAP_SIREN_TEMPLATE, or empty if map has no siren.
+
+    Returns:
+        dict: Key: enemy genre, Value: Template or None if not found.
+    """
+    templates = {}
+    for name in enemy:
+        templates[name] = globals().get(f'TEMPLATE_ENEMY_{name}')
+    for name in siren:
+        templates[f'Siren_{name}'] = globals().get(f'TEMPLATE_SIREN_{name}')
+    return templates
+
+
 class GridPredictor:
+    # Predictors in running order, method `predict_<name>` is called.
+    # Key: predictor name, Value: (grid attributes to set, names of predictors it depends on)
+    # Dependencies must come earlier in order, predictors with more than one attribute return a tuple.
+    PREDICTORS = {
+        # Siren enemies have no scale, and scale tells enemies without known genre,
+        # so they are always predicted together.
+        'enemy': (('enemy_scale', 'enemy_genre'), ()),
+        'boss': (('is_boss',), ()),
+        'submarine': (('is_submarine',), ()),
+        # Submarine is never a fleet, see predict_merge()
+        'fleet': (('is_fleet',), ()),
+        'mystery': (('is_mystery',), ()),
+        'current_fleet': (('is_current_fleet',), ()),
+        'missile_attack': (('is_missile_attack',), ()),
+    }
+    # Grid attributes set in predict_merge(), and the predictors they need.
+    PREDICT_DERIVED = {
+        'is_enemy': ('enemy',),
+        'is_siren': ('enemy',),
+    }
+
     def __init__(self, location, image, corner, config):
         """
         Args:
@@ -21,26 +95,19 @@ class GridPredictor:
         self.corner = corner
         self.config = config
 
-        # Calculate directly is faster than calling existing functions.
-        x0, y0, x1, y1, x2, y2, x3, y3 = corner.flatten()
-        divisor = x0 - x1 + x2 - x3
-        x = (x0 * x2 - x1 * x3) / divisor
-        y = (x0 * y2 - x1 * y2 + x2 * y0 - x3 * y0) / divisor
-        self._image_center = np.array([x, y, x, y])
-        self._image_a = (-x0 * x2 + x0 * x3 + x1 * x2 - x1 * x3) / divisor * self.config.GRID_IMAGE_A_MULTIPLY
-
-        self.template_enemy_genre = {}
-        for name in self.config.MAP_ENEMY_TEMPLATE:
-            self.template_enemy_genre[name] = globals().get(f'TEMPLATE_ENEMY_{name}')
-        if self.config.MAP_HAS_SIREN:
-            for name in self.config.MAP_SIREN_TEMPLATE:
-                self.template_enemy_genre[f'Siren_{name}'] = globals().get(f'TEMPLATE_SIREN_{name}')
+        geometry = grid_geometry(
+            tuple(corner.flatten().tolist()), tile=tuple(self.config.HOMO_TILE),
+            multiply=self.config.GRID_IMAGE_A_MULTIPLY)
+        self._image_center, self._image_a, self.area, self.homo_data, self.homo_invt = geometry
 
-        self.area = corner2area(self.corner)
-        self.homo_data = cv2.getPerspectiveTransform(
-            src=self.corner.astype(np.float32),
-            dst=area2corner((0, 0, *self.config.HOMO_TILE)).astype(np.float32))
-        self.homo_invt = cv2.invert(self.homo_data)[1]
+        self.template_enemy_genre = enemy_genre_templates(
+            enemy=tuple(self.config.MAP_ENEMY_TEMPLATE),
+            siren=tuple(self.config.MAP_SIREN_TEMPLATE) if self.config.MAP_HAS_SIREN else ())
+
+        # Predictors that already run on current image
+        self.predicted = set()
+        # Key: predictor name, Value: time cost in seconds
+        self.predict_time = {}
 
     def screen2grid(self, points):
         """
@@ -79,23 +146,80 @@ class GridPredictor:
         image_edge = cv2.morphologyEx(image_edge, cv2.MORPH_CLOSE, kernel)
         return image_edge
 
-    def predict(self):
-        self.enemy_scale = self.predict_enemy_scale()
-        self.enemy_genre = self.predict_enemy_genre()
-        self.is_boss = self.predict_boss()
-        self.is_submarine = self.predict_submarine()
-        if self.is_submarine:
-            self.is_fleet = False
+    def predictor_list(self, fields=None, cached=False):
+        """
+        Args:
+            fields (Iterable[str]): Grid attributes to predict, such as {'is_fleet', 'is_current_fleet'}.
+                See PREDICTORS and PREDICT_DERIVED. None for all.
+            cached (bool): True to skip predictors that already run on current image.
+
+        Returns:
+            list[str]: Names of predictors to run in order, including dependencies.
+        """
+        if fields is None:
+            names = set(self.PREDICTORS.keys())
         else:
-            self.is_fleet = self.predict_fleet()
-        if self.config.MAP_HAS_MYSTERY:
-            self.is_mystery = self.predict_mystery()
-        self.is_current_fleet = self.predict_current_fleet()
-        # self.is_caught_by_siren = self.predict_caught_by_siren()
+            predictors = {attr: name for name, (attrs, _) in self.PREDICTORS.items() for attr in attrs}
+            names = set()
+            for field in fields:
+                if field in self.PREDICT_DERIVED:
+                    names.update(self.PREDICT_DERIVED[field])
+                elif field in predictors:
+                    names.add(predictors[field])
+                else:
+                    raise ScriptError(f'Unknown grid predict field: {field}')
+            for name in list(names):
+                names.update(self.PREDICTORS[name][1])
+
+        enabled = {
+            'mystery': self.config.MAP_HAS_MYSTERY,
+            'missile_attack': self.config.MAP_HAS_MISSILE_ATTACK,
+        }
+        return [name for name in self.PREDICTORS.keys()
+                if name in names and enabled.get(name, True) and not (cached and name in self.predicted)]
+
+    def predict_set(self, name, result):
+        """
+        Set the result of a predictor to grid attribute.
 
-        if self.config.MAP_HAS_MISSILE_ATTACK:
-            if self.predict_missile_attack():
+        Args:
+            name (str): Predictor name.
+            result: Result of `predict_<name>`.
+        """
+        attrs = self.PREDICTORS[name][0]
+        if name == 'missile_attack':
+            # Missile attack remains until reset.
+            if result:
                 self.is_missile_attack = True
+        elif len(attrs) == 1:
+            self.__setattr__(attrs[0], result)
+        else:
+            for attr, value in zip(attrs, result):
+                self.__setattr__(attr, value)
+        self.predicted.add(name)
+
+    def predict(self, fields=None, cached=False):
+        """
+        Args:
+            fields (Iterable[str]): Grid attributes to predict, such as {'is_fleet', 'is_current_fleet'}.
+                See PREDICTORS and PREDICT_DERIVED. None for all.
+            cached (bool): True to skip predictors that already run on current image.
+        """
+        for name in self.predictor_list(fields, cached=cached):
+            start_time = time.perf_counter()
+            result = self.__getattribute__(f'predict_{name}')()
+            self.predict_time[name] = time.perf_counter() - start_time
+            self.predict_set(name, result)
+        # self.is_caught_by_siren = self.predict_caught_by_siren()
+
+        self.predict_merge()
+
+    def predict_merge(self):
+        """
+        Derive grid info from the results of predict methods.
+        """
+        if self.is_submarine:
+            self.is_fleet = False
         if self.enemy_genre:
             self.is_enemy = True
         if self.enemy_scale:
@@ -160,6 +284,13 @@ class GridPredictor:
         count = image[image > 0].shape[0]
         return count
 
+    def predict_enemy(self):
+        """
+        Returns:
+            int, str: Enemy scale and enemy genre.
+        """
+        return self.predict_enemy_scale(), self.predict_enemy_genre()
+
     def predict_enemy_scale(self):
         """
         Detect the icon on the upper-left which shows enemy scale: Large, Middle, Small.
@@ -0,0 +1,229 @@
+import time
+
+from module.base.decorator import cached_property
+from module.base.utils import *
+from module.config.config import AzurLaneConfig
+from module.exception import ScriptError
+from module.logger import logger
+from module.map_detection.grid_predictor import GridPredictor
+from module.template.assets import *
+
+
+class GridPredictorBatch:
+    """
+    Run GridPredictor.predict() on all grids at once.
+
+    Relative crops of the same area are stacked vertically into a mosaic,
+    tile i takes rows [i * height, (i + 1) * height).
+    Color filters run once on the mosaic, and template matching runs once per template,
+    then similarities are reduced in each tile.
+    Matching windows never go across tiles, so results are the same as matching each crop.
+    """
+    # Methods that are re-implemented in batch.
+    # Grids with any of them overridden, should be predicted one by one.
+    METHODS = [
+        'predict', 'relative_crop', 'predict_enemy', 'predict_enemy_scale', 'predict_enemy_genre', 'predict_boss',
+        'predict_submarine', 'predict_fleet', 'predict_mystery', 'predict_current_fleet', 'predict_missile_attack',
+    ]
+
+    def __init__(self, grids, config):
+        """
+        Args:
+            grids (list[GridPredictor]):
+            config (AzurLaneConfig):
+        """
+        self.grids = list(grids)
+        self.config = config
+        self.count = len(self.grids)
+        self._mosaic = {}
+        # Key: predictor name, Value: time cost in seconds
+        self.predict_time = {}
+
+    def reset(self):
+        """
+        Call this method after grid images changed.
+        """
+        self._mosaic = {}
+
+    @cached_property
+    def available(self):
+        """
+        Returns:
+            bool: If all grids use the default predict methods.
+        """
+        if not self.count:
+            return False
+        for cls in set(type(grid) for grid in self.grids):
+            for name in self.METHODS:
+                if getattr(cls, name) is not getattr(GridPredictor, name):
+                    return False
+        return True
+
+    def mosaic(self, area, shape):
+        """
+        Same as calling GridPredictor.relative_crop() on each grid and stacking the results vertically.
+
+        Args:
+            area (tuple): upper_left_x, upper_left_y, bottom_right_x, bottom_right_y, such as (-1, -1, 1, 1).
+            shape (tuple): Output image shape of each grid, (width, height).
+
+        Returns:
+            np.ndarray: Shape (height * count, width, channel).
+        """
+        key = (tuple(area), tuple(shape))
+        if key in self._mosaic:
+            return self._mosaic[key]
+
+        image = np.concatenate([grid.relative_crop(area, shape=shape) for grid in self.grids], axis=0)
+        self._mosaic[key] = image
+        return image
+
+    def tile_count(self, image):
+        """
+        Args:
+            image (np.ndarray): Monochrome mosaic.
+
+        Returns:
+            np.ndarray: Number of non-zero pixels in each tile, shape (count,).
+        """
+        return np.count_nonzero(image.reshape(self.count, -1), axis=1)
+
+    def tile_match(self, image, template):
+        """
+        Args:
+            image (np.ndarray): Mosaic.
+            template (Template):
+
+        Returns:
+            np.ndarray: Max similarity in each tile, shape (count,).
+        """
+        height = image.shape[0] // self.count
+        templates = template.image if template.is_gif else [template.image]
+        similarity = np.full(self.count, -1.)
+        for temp in templates:
+            h = temp.shape[0]
+            res = cv2.matchTemplate(image, temp, cv2.TM_CCOEFF_NORMED)
+            # Result has (height * count - h + 1) rows, pad it to be divisible, padded rows are dropped then.
+            res = np.pad(res, ((0, h - 1), (0, 0)), mode='constant', constant_values=-1.)
+            res = res.reshape(self.count, height, -1)[:, :height - h + 1]
+            similarity = np.maximum(similarity, res.max(axis=(1, 2)))
+        return similarity
+
+    def rgb_count(self, area, color, shape=(50, 50), threshold=221):
+        image = color_similarity_2d(self.mosaic(area, shape=shape), color=color)
+        return self.tile_count(image > threshold)
+
+    def hsv_count(self, area, h=(0, 360), s=(0, 100), v=(0, 100), shape=(50, 50)):
+        image = cv2.cvtColor(self.mosaic(area, shape=shape), cv2.COLOR_RGB2HSV)
+        lower = (h[0] / 2, s[0] * 2.55, v[0] * 2.55)
+        upper = (h[1] / 2 + 1, s[1] * 2.55 + 1, v[1] * 2.55 + 1)
+        return self.tile_count(cv2.inRange(image, lower, upper))
+
+    def predict_enemy(self):
+        return list(zip(self.predict_enemy_scale().tolist(), self.predict_enemy_genre().tolist()))
+
+    def predict_enemy_scale(self):
+        image = self.mosaic((-0.415 - 0.7, -0.62 - 0.7, -0.415, -0.62), shape=(50, 50))
+        red = color_similarity_2d(image, (255, 130, 132))
+        yellow = color_similarity_2d(image, (255, 235, 156))
+        large = self.tile_match(red, TEMPLATE_ENEMY_L) > 0.75
+        middle = self.tile_match(yellow, TEMPLATE_ENEMY_M) > 0.85
+        small = self.tile_match(yellow, TEMPLATE_ENEMY_S) > 0.85
+        return np.select([large, middle, small], [3, 2, 1], default=0)
+
+    def predict_enemy_genre(self):
+        template_enemy_genre = self.grids[0].template_enemy_genre
+        scaling_dic = self.config.MAP_ENEMY_GENRE_DETECTION_SCALING
+        image_dic = {}
+        genre = np.full(self.count, None, dtype=object)
+        for name, template in template_enemy_genre.items():
+            if template is None:
+                logger.warning(f'Enemy detection template not found: {name}')
+                logger.warning('Please create it with dev_tools/relative_record.py or dev_tools/relative_crop.py, '
+                               'then place it under ./assets/<server>/template')
+                raise ScriptError(f'Enemy detection template not found: {name}')
+
+            short_name = name[6:] if name.startswith('Siren_') else name
+            scaling = scaling_dic.get(short_name, 1)
+            scaling = (scaling,) if not isinstance(scaling, tuple) else scaling
+            for scale in scaling:
+                if scale not in image_dic:
+                    shape = tuple(np.round(np.array((60, 60)) * scale).astype(int))
+                    image_dic[scale] = rgb2gray(self.mosaic((-0.5, -1, 0.5, 0), shape=shape))
+
+                # First matched template wins
+                matched = (self.tile_match(image_dic[scale], template) > 0.85) & (genre == None)
+                genre[matched] = name
+
+        return genre
+
+    def predict_boss(self):
+        image = self.mosaic((-0.55, -0.2, 0.45, 0.2), shape=(50, 20))
+        image = color_similarity_2d(image, color=(255, 77, 82))
+        boss = self.tile_match(image, TEMPLATE_ENEMY_BOSS) > 0.75
+
+        # Small boss icon
+        if np.any(~boss):
+            count = self.hsv_count(area=(0.03, -0.15, 0.63, 0.15), h=(358 - 3, 358 + 3), shape=(50, 20))
+            if np.any(count > 100):
+                image = self.mosaic((0.03, -0.15, 0.63, 0.15), shape=(50, 20))
+                image = color_similarity_2d(image, color=(255, 77, 82))
+                boss |= (count > 100) & (self.tile_match(image, TEMPLATE_ENEMY_BOSS) > 0.7)
+
+        return boss
+
+    def predict_missile_attack(self):
+        return self.rgb_count(area=(-0.5, -1, 0.5, 0), color=(255, 255, 60), shape=(50, 50)) > 35
+
+    def predict_fleet(self):
+        image = self.mosaic((-1, -2, -0.5, -1.5), shape=(50, 50))
+        image = color_similarity_2d(image, color=(255, 255, 255))
+        return self.tile_match(image, TEMPLATE_FLEET_AMMO) > 0.85
+
+    def predict_submarine(self):
+        image = self.mosaic((-0.86, 0.08, -0.36, 0.58), shape=(50, 50))
+        image = color_similarity_2d(image, color=(255, 243, 156))
+        return self.tile_match(image, TEMPLATE_SUBMARINE) > 0.85
+
+    def predict_mystery(self):
+        return self.rgb_count(area=(-0.3, -2, 0.3, -0.6), color=(148, 255, 247), shape=(20, 50)) > 50
+
+    def predict_current_fleet(self):
+        count = self.hsv_count(area=(-0.5, -3.5, 0.5, -2.5), h=(141 - 3, 141 + 10), shape=(50, 50))
+        current = count >= 600
+        if not np.any(current):
+            return current
+
+        image = self.mosaic((-0.5, -3.5, 0.5, -2.5), shape=(60, 60))
+        image = color_similarity_2d(image, color=(24, 255, 107))
+        return current & (self.tile_match(image, TEMPLATE_FLEET_CURRENT) > 0.85)
+
+    def predict(self, fields=None, cached=False):
+        """
+        Same as calling GridPredictor.predict() on each grid.
+
+        Args:
+            fields (Iterable[str]): Grid attributes to predict. None for all.
+            cached (bool): True to skip predictors that already run on all grids.
+                Predictors are still run on all grids if any grid needs it.
+        """
+        # Predictors that any grid needs
+        names = set()
+        for grid in self.grids:
+            names.update(grid.predictor_list(fields, cached=cached))
+        result = {}
+        self.predict_time = {}
+        for name in GridPredictor.PREDICTORS.keys():
+            if name not in names:
+                continue
+            start_time = time.perf_counter()
+            result[name] = self.__getattribute__(f'predict_{name}')()
+            self.predict_time[name] = time.perf_counter() - start_time
+
+        for index, grid in enumerate(self.grids):
+            for name, value in result.items():
+                value = value[index]
+                if isinstance(value, np.generic):
+                    value = value.item()
+                grid.predict_set(name, value)
+            grid.predict_merge()
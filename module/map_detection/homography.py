@@ -55,6 +55,8 @@ class Homography:
 
     map_inner: np.ndarray
     _map_edge_count: tuple
+    # Location of the good tile center match in previous image, used in tracking
+    track_loca: np.ndarray
 
     def __init__(self, config):
         """
@@ -63,33 +65,23 @@ class Homography:
         """
         self.config = config
         self.homo_loaded = False
+        self.track_loca = None
 
-    @cached_property
+    @property
     def ui_mask_homo_stroke(self):
-        if self.config.Scheduler_Command.startswith('Opsi'):
-            mask = ASSETS.ui_mask_os
-        else:
-            mask = ASSETS.ui_mask
-        image = cv2.warpPerspective(mask, self.homo_data, self.homo_size)
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
-        image = cv2.erode(image, kernel).astype('uint8')
-        # Remove edges, perspective transform may produce aliasing
-        pad = 2
-        image[:pad, :] = 0
-        image[-pad:, :] = 0
-        image[:, :pad] = 0
-        image[:, -pad:] = 0
-        return image
-
-    def load(self, image):
+        return ASSETS.ui_mask_homo_stroke(
+            self.homo_data, self.homo_size, is_os=self.config.Scheduler_Command.startswith('Opsi'))
+
+    def load(self, image, track=True):
         """
         Args:
             image (np.ndarray): Shape (720, 1280, 3)
+            track (bool): True to search free tile around the previous match first.
         """
         if not self.homo_loaded:
             self.load_homography(storage=self.config.HOMO_STORAGE, image=image)
 
-        self.detect(image)
+        self.detect(image, track=track)
 
     def load_homography(self, storage=None, perspective=None, image=None, file=None):
         """
@@ -152,11 +144,14 @@ class Homography:
         self.homo_invt = cv2.invert(homo)[1]
         self.homo_size = tuple(size.tolist())
         self.homo_loaded = True
+        self.track_loca = None
 
-    def detect(self, image):
+    def detect(self, image, track=True):
         """
         Args:
             image (np.ndarray): Screenshot.
+            track (bool): True to search free tile around the previous match first,
+                and fallback to full search if failed.
 
         Returns:
             bool: If success.
@@ -178,8 +173,12 @@ class Homography:
         # Image.fromarray(image_edge, mode='L').show()
 
         # Find free tile
-        if self.search_tile_center(image_edge, threshold_good=self.config.HOMO_CENTER_GOOD_THRESHOLD,
-                                   threshold=self.config.HOMO_CENTER_THRESHOLD):
+        if track and self.config.HOMO_TRACKING \
+                and self.track_tile_center(image_edge, radius=self.config.HOMO_TRACKING_RADIUS,
+                                           threshold=self.config.HOMO_CENTER_GOOD_THRESHOLD):
+            pass
+        elif self.search_tile_center(image_edge, threshold_good=self.config.HOMO_CENTER_GOOD_THRESHOLD,
+                                     threshold=self.config.HOMO_CENTER_THRESHOLD):
             pass
         elif self.search_tile_corner(image_edge, threshold=self.config.HOMO_CORNER_THRESHOLD):
             pass
@@ -230,20 +229,61 @@ class Homography:
         if similarity > threshold_good:
             self.homo_loca = np.array(loca) - self.config.HOMO_CENTER_OFFSET
             self.map_inner = np.array(loca)
+            self.track_loca = np.array(loca)
             message = 'good match'
         elif similarity > threshold:
             location = np.argwhere(result > threshold)[:, ::-1]
             self.homo_loca = fit_points(
                 location, mod=self.config.HOMO_TILE, encourage=encourage) - self.config.HOMO_CENTER_OFFSET
             self.map_inner = get_map_inner(location)
+            self.track_loca = None
             message = f'{len(location)} matches'
         else:
+            self.track_loca = None
             message = 'bad match'
 
         # print(self.homo_loca % self.config.HOMO_TILE)
         logger.attr_align('tile_center', f'{float2str(similarity)} ({message})')
         return message != 'bad match'
 
+    def track_tile_center(self, image, radius=20, threshold=0.9):
+        """
+        Search for the center of empty tile around the good match in previous image.
+        Camera doesn't move between most screenshots, or moves in whole tiles which doesn't change `homo_loca`,
+        so a local search is enough and much cheaper than `search_tile_center`.
+        Match on the window edge is not accepted, because the true peak may be outside the window.
+
+        Args:
+            image (np.ndarray): Monochrome image.
+            radius (int): Search radius in pixels.
+            threshold (float):
+
+        Returns:
+            bool: If success.
+        """
+        if self.track_loca is None:
+            return False
+
+        h, w = ASSETS.tile_center_image.shape
+        x1, y1 = np.maximum(self.track_loca - radius, 0)
+        x2, y2 = np.minimum(self.track_loca + (w + radius, h + radius), image.shape[::-1])
+        if x2 - x1 < w or y2 - y1 < h:
+            return False
+        result = cv2.matchTemplate(image[y1:y2, x1:x2], ASSETS.tile_center_image, cv2.TM_CCOEFF_NORMED)
+        _, similarity, _, loca = cv2.minMaxLoc(result)
+        # Best match on window edge, true peak may be outside
+        if loca[0] in (0, result.shape[1] - 1) or loca[1] in (0, result.shape[0] - 1):
+            return False
+        if similarity > threshold:
+            loca = np.add(loca, (x1, y1))
+            self.homo_loca = loca - self.config.HOMO_CENTER_OFFSET
+            self.map_inner = loca
+            self.track_loca = loca
+            logger.attr_align('tile_center', f'{float2str(similarity)} (tracked)')
+            return True
+        else:
+            return False
+
     def search_tile_corner(self, image, threshold=0.8, encourage=1.0):
         """
         Search for the corner of empty tile.
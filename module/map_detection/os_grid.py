@@ -145,7 +145,16 @@ class OSGridInfo(GridInfo):
 
 
 class OSGridPredictor(GridPredictor):
-    def predict(self):
+    def predict(self, fields=None, cached=False):
+        """
+        Args:
+            fields (Iterable[str]): Grid attributes to predict, using the predictors in GridPredictor.
+                None for all OS attributes.
+            cached (bool): True to skip predictors that already run on current image.
+        """
+        if fields is not None:
+            return super().predict(fields=fields, cached=cached)
+
         self.enemy_genre = self.predict_enemy_genre()
         # self.enemy_scale = self.predict_enemy_scale()
         # self.is_resource = self.predict_resource()
@@ -154,9 +163,11 @@ class OSGridPredictor(GridPredictor):
         self.is_akashi = self.enemy_genre == 'Akashi'
         self.is_scanning_device = self.enemy_genre == 'ScanningDevice'
         self.is_logging_tower = self.enemy_genre == 'LoggingTower'
-        self.is_current_fleet = self.predict_current_fleet()
+        if not (cached and 'current_fleet' in self.predicted):
+            self.is_current_fleet = self.predict_current_fleet()
         self.is_fleet = self.is_current_fleet
         self.is_fleet_mechanism = self.predict_fleet_mechanism()
+        self.predicted.update(['current_fleet', 'fleet'])
 
         if self.enemy_genre:
             self.is_enemy = True
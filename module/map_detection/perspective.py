@@ -1,5 +1,6 @@
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from PIL import Image, ImageDraw, ImageOps
@@ -50,6 +51,9 @@ class Perspective:
     vanish_point: tuple
     distant_point: tuple
     map_inner: np.ndarray
+    # Key: stage name, value: time cost in seconds
+    stage_time: dict
+    _executor: ThreadPoolExecutor = None
 
     def __init__(self, config):
         """
@@ -57,6 +61,9 @@ class Perspective:
             config (AzurLaneConfig):
         """
         self.config = config
+        # Solutions of the previous image, to warm-start the next fitting
+        self.vanish_point = None
+        self.distant_point = None
 
     def load(self, image):
         """
@@ -65,41 +72,48 @@ class Perspective:
         """
         start_time = time.time()
         self.image = image
+        self.stage_time = {}
 
         # Image initialisation
-        image = self.load_image(image)
+        image = self._run_stage('image', self.load_image, image=image)
 
         # Lines detection
-        inner_h = self.detect_lines(
-            image,
-            is_horizontal=True,
-            param=self.config.INTERNAL_LINES_FIND_PEAKS_PARAMETERS,
-            threshold=self.config.INTERNAL_LINES_HOUGHLINES_THRESHOLD,
-            theta=self.config.HORIZONTAL_LINES_THETA_THRESHOLD
-        ).move(*self.config.DETECTING_AREA[:2])
-        inner_v = self.detect_lines(
-            image,
-            is_horizontal=False,
-            param=self.config.INTERNAL_LINES_FIND_PEAKS_PARAMETERS,
-            threshold=self.config.INTERNAL_LINES_HOUGHLINES_THRESHOLD,
-            theta=self.config.VERTICAL_LINES_THETA_THRESHOLD
-        ).move(*self.config.DETECTING_AREA[:2])
-        edge_h = self.detect_lines(
-            image,
-            is_horizontal=True,
-            param=self.config.EDGE_LINES_FIND_PEAKS_PARAMETERS,
-            threshold=self.config.EDGE_LINES_HOUGHLINES_THRESHOLD,
-            theta=self.config.HORIZONTAL_LINES_THETA_THRESHOLD,
-            pad=self.config.DETECTING_AREA[2] - self.config.DETECTING_AREA[0]
-        ).move(*self.config.DETECTING_AREA[:2])
-        edge_v = self.detect_lines(
-            image,
-            is_horizontal=False,
-            param=self.config.EDGE_LINES_FIND_PEAKS_PARAMETERS,
-            threshold=self.config.EDGE_LINES_HOUGHLINES_THRESHOLD,
-            theta=self.config.VERTICAL_LINES_THETA_THRESHOLD,
-            pad=self.config.DETECTING_AREA[3] - self.config.DETECTING_AREA[1]
-        ).move(*self.config.DETECTING_AREA[:2])
+        lines = self._run_stages({
+            'inner_h': (self.detect_lines, dict(
+                image=image,
+                is_horizontal=True,
+                param=self.config.INTERNAL_LINES_FIND_PEAKS_PARAMETERS,
+                threshold=self.config.INTERNAL_LINES_HOUGHLINES_THRESHOLD,
+                theta=self.config.HORIZONTAL_LINES_THETA_THRESHOLD
+            )),
+            'inner_v': (self.detect_lines, dict(
+                image=image,
+                is_horizontal=False,
+                param=self.config.INTERNAL_LINES_FIND_PEAKS_PARAMETERS,
+                threshold=self.config.INTERNAL_LINES_HOUGHLINES_THRESHOLD,
+                theta=self.config.VERTICAL_LINES_THETA_THRESHOLD
+            )),
+            'edge_h': (self.detect_lines, dict(
+                image=image,
+                is_horizontal=True,
+                param=self.config.EDGE_LINES_FIND_PEAKS_PARAMETERS,
+                threshold=self.config.EDGE_LINES_HOUGHLINES_THRESHOLD,
+                theta=self.config.HORIZONTAL_LINES_THETA_THRESHOLD,
+                pad=self.config.DETECTING_AREA[2] - self.config.DETECTING_AREA[0]
+            )),
+            'edge_v': (self.detect_lines, dict(
+                image=image,
+                is_horizontal=False,
+                param=self.config.EDGE_LINES_FIND_PEAKS_PARAMETERS,
+                threshold=self.config.EDGE_LINES_HOUGHLINES_THRESHOLD,
+                theta=self.config.VERTICAL_LINES_THETA_THRESHOLD,
+                pad=self.config.DETECTING_AREA[3] - self.config.DETECTING_AREA[1]
+            )),
+        })
+        inner_h = lines['inner_h'].move(*self.config.DETECTING_AREA[:2])
+        inner_v = lines['inner_v'].move(*self.config.DETECTING_AREA[:2])
+        edge_h = lines['edge_h'].move(*self.config.DETECTING_AREA[:2])
+        edge_v = lines['edge_v'].move(*self.config.DETECTING_AREA[:2])
 
         # Lines pre-cleansing
         horizontal = inner_h.add(edge_h).group()
@@ -119,8 +133,9 @@ class Perspective:
 
         # Calculate perspective
         self.crossings = self.horizontal.cross(self.vertical)
-        self.vanish_point = optimize.brute(self._vanish_point_value, self.config.VANISH_POINT_RANGE)
-        distance_point_x = optimize.brute(self._distant_point_value, self.config.DISTANCE_POINT_X_RANGE)[0]
+        previous = (self.vanish_point, self.distant_point)
+        self.vanish_point = self._run_stage('vanish_point', self.solve_vanish_point, previous=previous[0])
+        distance_point_x = self._run_stage('distant_point', self.solve_distant_point, previous=previous[1])[0]
         self.distant_point = (distance_point_x, self.vanish_point[1])
         logger.attr_align('vanish_point', point2str(*self.vanish_point, length=5))
         logger.attr_align('distant_point', point2str(*self.distant_point, length=5))
@@ -137,10 +152,12 @@ class Perspective:
         # Lines cleansing
         # self.draw()
         self.map_inner = get_map_inner(self.crossings.points)
-        self.horizontal, self.lower_edge, self.upper_edge = self.line_cleanse(
-            self.horizontal, inner=inner_h.group(), edge=edge_h)
-        self.vertical, self.left_edge, self.right_edge = self.line_cleanse(
-            self.vertical, inner=inner_v.group(), edge=edge_v)
+        lines = self._run_stages({
+            'cleanse_h': (self.line_cleanse, dict(lines=self.horizontal, inner=inner_h.group(), edge=edge_h)),
+            'cleanse_v': (self.line_cleanse, dict(lines=self.vertical, inner=inner_v.group(), edge=edge_v)),
+        })
+        self.horizontal, self.lower_edge, self.upper_edge = lines['cleanse_h']
+        self.vertical, self.left_edge, self.right_edge = lines['cleanse_v']
 
         # self.draw()
         # print(self.horizontal)
@@ -159,6 +176,55 @@ class Perspective:
             '\\' if self.right_edge else ' ', len(self.vertical), len(vertical), len(edge_v))
                     )
 
+    @classmethod
+    def _get_executor(cls, threads):
+        if cls._executor is None or cls._executor._max_workers != threads:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False)
+            cls._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='perspective')
+        return cls._executor
+
+    def _run_stage(self, name, func, **kwargs):
+        """
+        Run a stage of detection and record its time cost in `self.stage_time`.
+
+        Args:
+            name (str): Stage name.
+            func (callable):
+            **kwargs: Arguments of func.
+
+        Returns:
+            Return of func.
+        """
+        start = time.time()
+        result = func(**kwargs)
+        self.stage_time[name] = time.time() - start
+        return result
+
+    def _run_stages(self, stages):
+        """
+        Run independent stages of detection.
+        If PERSPECTIVE_DETECTION_THREADS > 0, stages run concurrently in a thread pool,
+        OpenCV and SciPy release the GIL in heavy computations.
+
+        Args:
+            stages (dict): Key: stage name, value: (func, kwargs)
+
+        Returns:
+            dict: Key: stage name, value: return of func
+        """
+        # Keep stages in order in stage_time
+        for name in stages:
+            self.stage_time[name] = 0.
+        threads = self.config.PERSPECTIVE_DETECTION_THREADS
+        if threads > 0 and len(stages) > 1:
+            executor = self._get_executor(threads)
+            futures = {name: executor.submit(self._run_stage, name, func, **kwargs)
+                       for name, (func, kwargs) in stages.items()}
+            return {name: future.result() for name, future in futures.items()}
+        else:
+            return {name: self._run_stage(name, func, **kwargs) for name, (func, kwargs) in stages.items()}
+
     def load_image(self, image):
         """Method that turns image to monochrome and hide UI.
 
@@ -169,7 +235,9 @@ class Perspective:
             np.ndarray
         """
         image = rgb2gray(crop(image, self.config.DETECTING_AREA))
-        image = cv2.subtract(255, cv2.bitwise_and(image, ASSETS.ui_mask))
+        # Image is a new array, apply mask in place
+        cv2.bitwise_and(image, ASSETS.ui_mask, dst=image)
+        cv2.subtract(255, image, dst=image)
         return image
 
     @staticmethod
@@ -298,6 +366,96 @@ class Perspective:
         distance = np.sum(np.log10(np.diff(mid) + 0.001))  # Add 0.001 to avoid log10(0).
         return distance
 
+    @staticmethod
+    def _in_range(points, ranges):
+        """
+        Args:
+            points (np.ndarray): Shape (n, dim)
+            ranges (tuple): ((min, max), ...) of each dim
+
+        Returns:
+            np.ndarray: Shape (n,), bool
+        """
+        ranges = np.array(ranges)
+        return np.all((points >= ranges[:, 0]) & (points <= ranges[:, 1]), axis=1)
+
+    def solve_vanish_point(self, previous=None):
+        """
+        Fit vanish point from vertical lines, fallback to brute force if unable to fit.
+
+        Candidates are the intersections of every two vertical lines, the least squares intersection of all lines,
+        and the vanish point of previous image. The best candidate on `_vanish_point_value` is refined by fmin,
+        which is the same as the finishing step of `optimize.brute`,
+        but it only evaluates tens of candidates instead of a full grid.
+
+        Args:
+            previous (tuple, np.ndarray): Vanish point of previous image.
+
+        Returns:
+            np.ndarray: np.array([x, y])
+        """
+        if self.config.VANISH_POINT_BRUTE_FORCE or len(self.vertical) < 2:
+            return optimize.brute(self._vanish_point_value, self.config.VANISH_POINT_RANGE)
+
+        rho, cos, sin = self.vertical.rho, self.vertical.cos, self.vertical.sin
+        # Least squares
+        candidates = [np.linalg.lstsq(np.array([cos, sin]).T, rho, rcond=None)[0]]
+        # Intersections of every two lines
+        i, j = np.triu_indices(len(rho), k=1)
+        det = cos[i] * sin[j] - sin[i] * cos[j]
+        i, j, det = i[np.abs(det) > 1e-6], j[np.abs(det) > 1e-6], det[np.abs(det) > 1e-6]
+        x = (rho[i] * sin[j] - rho[j] * sin[i]) / det
+        y = (cos[i] * rho[j] - cos[j] * rho[i]) / det
+        candidates += list(np.array([x, y]).T)
+        if previous is not None:
+            candidates.append(previous)
+        candidates = np.array(candidates)
+        candidates = candidates[self._in_range(candidates, self.config.VANISH_POINT_RANGE)]
+        if not len(candidates):
+            logger.info('Unable to fit vanish point, use brute force')
+            return optimize.brute(self._vanish_point_value, self.config.VANISH_POINT_RANGE)
+
+        # Same as _vanish_point_value(), but on all candidates
+        distance = rho[:, np.newaxis] - np.outer(cos, candidates[:, 0]) - np.outer(sin, candidates[:, 1])
+        value = np.sum(np.log10(np.abs(distance) + 0.001), axis=0)
+        return optimize.fmin(self._vanish_point_value, candidates[np.argmin(value)], disp=False)
+
+    def solve_distant_point(self, previous=None):
+        """
+        Fit distant point from crossings, fallback to brute force if unable to fit.
+
+        Diagonals of grids meet at distant point, so candidates are where diagonals of adjacent crossings
+        reach the horizon `y = vanish_point[1]`, and the distant point of previous image.
+        The best candidate on `_distant_point_value` is refined by fmin.
+
+        Args:
+            previous (tuple, np.ndarray): Distant point of previous image.
+
+        Returns:
+            np.ndarray: np.array([x])
+        """
+        if self.config.VANISH_POINT_BRUTE_FORCE or len(self.horizontal) < 2 or len(self.vertical) < 2:
+            return optimize.brute(self._distant_point_value, self.config.DISTANCE_POINT_X_RANGE)
+
+        # Crossings are in the order of horizontal lines then vertical lines.
+        grid = self.crossings.points.reshape(len(self.horizontal), len(self.vertical), 2)
+        start, end = grid[:-1, :-1].reshape(-1, 2), grid[1:, 1:].reshape(-1, 2)
+        dy = end[:, 1] - start[:, 1]
+        start, end, dy = start[np.abs(dy) > 1e-6], end[np.abs(dy) > 1e-6], dy[np.abs(dy) > 1e-6]
+        x = start[:, 0] + (self.vanish_point[1] - start[:, 1]) * (end[:, 0] - start[:, 0]) / dy
+        candidates = list(x)
+        if previous is not None:
+            candidates.append(previous[0])
+        # Nearby candidates have the same result after fmin
+        candidates = np.unique(np.round(np.array(candidates) / 10) * 10)[:, np.newaxis]
+        candidates = candidates[self._in_range(candidates, self.config.DISTANCE_POINT_X_RANGE)]
+        if not len(candidates):
+            logger.info('Unable to fit distant point, use brute force')
+            return optimize.brute(self._distant_point_value, self.config.DISTANCE_POINT_X_RANGE)
+
+        value = [self._distant_point_value(x) for x in candidates]
+        return optimize.fmin(self._distant_point_value, candidates[np.argmin(value)], disp=False)
+
     def mid_cleanse(self, mids, is_horizontal, threshold=3):
         """
         Args:
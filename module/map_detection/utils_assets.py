@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 import cv2
 import numpy as np
 
@@ -10,6 +12,9 @@ UI_MASK_OS = Mask(file='./assets/mask/MASK_OS_MAP_UI.png')
 TILE_CENTER = Mask(file='./assets/map_detection/TILE_CENTER.png')
 TILE_CORNER = Mask(file='./assets/map_detection/TILE_CORNER.png')
 DETECTING_AREA = (123, 55, 1280, 720)
+# Each warped UI mask takes about 1.3MB.
+# Maps with HOMO_STORAGE have the same homography across runs, others get a new one from perspective on every run.
+UI_MASK_HOMO_CACHE_SIZE = 2
 
 
 class Assets:
@@ -39,6 +44,49 @@ class Assets:
         # area = (-123, -55, 1157, 665)
         return crop(self.ui_mask_os, area)
 
+    @cached_property
+    def ui_mask_homo_stroke_cache(self):
+        """
+        Least recently used first.
+        Key: (homo_data in bytes, homo_size, is_os), Value: np.ndarray
+        """
+        return OrderedDict()
+
+    def ui_mask_homo_stroke(self, homo_data, homo_size, is_os=False):
+        """
+        UI mask in the geometry of homography output, with strokes removed.
+        The latest UI_MASK_HOMO_CACHE_SIZE masks are cached, so they survive across Homography instances.
+
+        Args:
+            homo_data (np.ndarray): Homography matrix.
+            homo_size (tuple): Output size of homography, (width, height).
+            is_os (bool): True to use the UI mask of Operation Siren.
+
+        Returns:
+            np.ndarray:
+        """
+        key = (homo_data.tobytes(), tuple(homo_size), is_os)
+        cache = self.ui_mask_homo_stroke_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        mask = self.ui_mask_os if is_os else self.ui_mask
+        image = cv2.warpPerspective(mask, homo_data, homo_size)
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+        image = cv2.erode(image, kernel).astype('uint8')
+        # Remove edges, perspective transform may produce aliasing
+        pad = 2
+        image[:pad, :] = 0
+        image[-pad:, :] = 0
+        image[:, :pad] = 0
+        image[:, -pad:] = 0
+
+        cache[key] = image
+        while len(cache) > UI_MASK_HOMO_CACHE_SIZE:
+            cache.popitem(last=False)
+        return image
+
     @cached_property
     def tile_center_image(self):
         return TILE_CENTER.image
@@ -7,6 +7,7 @@ from module.logger import logger
 from module.map.map_grids import SelectedGrids
 from module.map_detection.detector import MapDetector
 from module.map_detection.grid import Grid
+from module.map_detection.grid_predictor_batch import GridPredictorBatch
 from module.map_detection.utils import *
 from module.map_detection.utils_assets import *
 
@@ -17,6 +18,8 @@ class View(MapDetector):
     center_loca: tuple
     center_offset: np.ndarray
     swipe_base: np.ndarray
+    # Key: predictor name, Value: time cost in seconds, summed over all grids
+    predict_time: dict
 
     def __init__(self, config, mode='main', grid_class=Grid):
         """
@@ -54,7 +57,8 @@ class View(MapDetector):
         Args:
             image:
         """
-        image = self._image_clear_ui(np.array(image))
+        # _image_clear_ui() returns a new array, no need to copy
+        image = self._image_clear_ui(np.asarray(image))
         self.image = image
         super().load(image)
 
@@ -80,6 +84,7 @@ class View(MapDetector):
         else:
             self.grids = grids
         self.shape = np.max(list(self.grids.keys()), axis=0)
+        self.batch = GridPredictorBatch(self, config=self.config)
 
         # Find local view center
         for loca, grid in self.grids.items():
@@ -97,15 +102,35 @@ class View(MapDetector):
                 raise MapDetectionError(f'Camera outside map: offset=({x}, {y})')
             break
 
-    def predict(self):
+    def predict(self, fields=None, cached=False):
         """
         Predict grid info.
+
+        Args:
+            fields (Iterable[str]): Grid attributes to predict, such as {'is_fleet', 'is_current_fleet'}.
+                See GridPredictor.PREDICTORS and GridPredictor.PREDICT_DERIVED. None for all.
+            cached (bool): True to skip predictors that already run on current image.
         """
         start_time = time.time()
-        for grid in self:
-            grid.predict()
+        self._predict(fields=fields, cached=cached)
         logger.attr_align('predict', len(self.grids.keys()), front=float2str(time.time() - start_time) + 's')
 
+    def _predict(self, fields=None, cached=False):
+        """
+        Same as predict(), but without logs.
+        """
+        if self.config.MAP_GRID_PREDICT_BATCH and self.batch.available:
+            self.batch.predict(fields=fields, cached=cached)
+            self.predict_time = self.batch.predict_time
+        else:
+            for grid in self:
+                grid.predict_time = {}
+                grid.predict(fields=fields, cached=cached)
+            self.predict_time = collections.Counter()
+            for grid in self:
+                self.predict_time.update(grid.predict_time)
+            self.predict_time = dict(self.predict_time)
+
     def update(self, image):
         """
         Update image to all grids.
@@ -116,6 +141,7 @@ class View(MapDetector):
         for grid in self:
             grid.reset()
             grid.image = image
+        self.batch.reset()
 
     def select(self, **kwargs):
         """
@@ -154,12 +180,10 @@ class View(MapDetector):
         offset = np.subtract(self.center_loca, prev.center_loca)
 
         if with_current_fleet:
-            for grid in self:
-                grid.is_fleet = grid.predict_fleet()
-                grid.is_current_fleet = grid.predict_current_fleet()
-            for grid in prev:
-                grid.is_fleet = grid.predict_fleet()
-                grid.is_current_fleet = grid.predict_current_fleet()
+            # Previous view is predicted already, current view is predicted before a full predict,
+            # and the full predict reuses the results.
+            self._predict(fields=('is_fleet', 'is_current_fleet'), cached=True)
+            prev._predict(fields=('is_fleet', 'is_current_fleet'), cached=True)
 
             # If able to find current fleet, use it to predict swipe
             current_fleet = self.select(is_fleet=True, is_current_fleet=True)
@@ -1,6 +1,7 @@
 import os
 
 import cv2
+import mxnet as mx
 import numpy as np
 from cnocr import CnOcr
 from cnocr.cn_ocr import (check_model_name, data_dir, gen_network, load_module,
@@ -86,12 +87,55 @@ class AlOcr(CnOcr):
 
         return super().ocr_for_single_line(img_fp)
 
-    def ocr_for_single_lines(self, img_list):
+    def ocr_for_single_lines(self, img_list, confidence=False):
         if not self._model_loaded:
             self.init(*self._args)
             self._model_loaded = True
 
-        return super().ocr_for_single_lines(img_list)
+        if not confidence:
+            return super().ocr_for_single_lines(img_list)
+        if len(img_list) == 0:
+            return []
+
+        img_list = [self._preprocess_img_array(img) for img in img_list]
+        img_list, img_widths = self._pad_arrays(img_list)
+        return self.ocr_for_batch(np.array(img_list), img_widths, confidence=True)
+
+    def ocr_for_batch(self, batch, img_widths, confidence=False):
+        """
+        Batch recognize lines that are already in model input layout,
+        which is the same as `ocr_for_single_lines` but skips `_preprocess_img_array` and `_pad_arrays`.
+
+        Args:
+            batch (np.ndarray): Shape (n, 1, img_height, max_width), float32 in 0-1.
+            img_widths (list[int]): Width of each line before padding.
+            confidence (bool): True to return probabilities along with characters.
+
+        Returns:
+            list[list[str]]: Such as [['第', '一', '行'], ['第', '二', '行']]
+                If confidence, returns list of [chars, char_probs, line_confidence], such as
+                [[['1', '4'], [0.99, 0.97], 0.95], ...]
+        """
+        if not self._model_loaded:
+            self.init(*self._args)
+            self._model_loaded = True
+
+        batch_size = len(img_widths)
+        if batch_size == 0:
+            return []
+
+        prob = self._predict(mx.nd.array(batch))
+        # [seq_len, batch_size, num_classes]
+        prob = np.reshape(prob, (-1, batch_size, prob.shape[1]))
+
+        if self._cand_alph_idx is not None:
+            prob = prob * self._gen_mask(prob.shape)
+
+        max_width = max(img_widths)
+        if confidence:
+            return [self._gen_line_pred_result(prob[:, i, :], img_widths[i], max_width) for i in range(batch_size)]
+        else:
+            return [self._gen_line_pred_chars(prob[:, i, :], img_widths[i], max_width) for i in range(batch_size)]
 
     def set_cand_alphabet(self, cand_alphabet):
         if not self._model_loaded:
@@ -165,20 +209,41 @@ class AlOcr(CnOcr):
         :param max_img_width:
         :return:
         """
+        return self._gen_line_pred_result(line_prob, img_width, max_img_width)[0]
+
+    def _gen_line_pred_result(self, line_prob, img_width, max_img_width):
+        """
+        Get the predicted characters and their probabilities.
+
+        Args:
+            line_prob (np.ndarray): Shape (seq_length, num_classes)
+            img_width (int):
+            max_img_width (int):
+
+        Returns:
+            list: [chars, char_probs, line_confidence].
+                Probability of a character is the maximum probability in its CTC span.
+                Line confidence is the minimum of character probabilities and probabilities of deleted frames,
+                so a low confidence result means some character was uncertain, even if it got deleted.
+        """
         class_ids = np.argmax(line_prob, axis=-1)
+        max_prob = np.max(line_prob, axis=-1)
 
-        class_ids *= np.max(line_prob, axis=-1) > 0.5  # Delete low confidence result
+        class_ids *= max_prob > 0.5  # Delete low confidence result
 
+        end_idx = len(class_ids)
         if img_width < max_img_width:
             comp_ratio = self._hp.seq_len_cmpr_ratio
-            end_idx = img_width // comp_ratio
-            if end_idx < len(class_ids):
-                class_ids[end_idx:] = 0
+            end_idx = min(img_width // comp_ratio, end_idx)
+            class_ids[end_idx:] = 0
         prediction, start_end_idx = CtcMetrics.ctc_label(class_ids.tolist())
         alphabet = self._alphabet
         res = [alphabet[p] if alphabet[p] != '<space>' else ' ' for p in prediction]
+        probs = [float(np.max(line_prob[start:end, p])) for p, (start, end) in zip(prediction, start_end_idx)]
+        deleted = max_prob[:end_idx][max_prob[:end_idx] <= 0.5]
+        line_confidence = float(min(probs + deleted.tolist(), default=1.))
 
-        return res
+        return [res, probs, line_confidence]
 
     def debug(self, img_list):
         """
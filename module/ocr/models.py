@@ -1,5 +1,11 @@
 from module.base.decorator import cached_property
-from module.ocr.al_ocr import AlOcr
+from module.ocr.rpc import deploy_config
+
+if deploy_config.config.get('OcrBackend', 'mxnet') == 'numpy':
+    # Same models running in numpy, no need to import mxnet
+    from module.ocr.numpy_ocr import NumpyOcr as AlOcr
+else:
+    from module.ocr.al_ocr import AlOcr
 
 
 class OcrModel:
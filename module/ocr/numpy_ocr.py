@@ -0,0 +1,566 @@
+import ast
+import json
+import os
+import struct
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from module.exception import RequestHumanTakeover, ScriptError
+from module.logger import logger
+
+# Magic numbers in mxnet NDArray serialization
+NDARRAY_LIST_MAGIC = 0x112
+NDARRAY_V2_MAGIC = 0xF993FAC9
+NDARRAY_V3_MAGIC = 0xF993FACA
+# mxnet type_flag to numpy dtype
+MXNET_DTYPE = {0: np.float32, 1: np.float64, 2: np.float16, 3: np.uint8, 4: np.int32, 5: np.int8, 6: np.int64}
+
+
+def load_mxnet_params(file):
+    """
+    Read a mxnet `.params` file without importing mxnet.
+
+    Args:
+        file (str):
+
+    Returns:
+        dict: Key: parameter name without `arg:` or `aux:` prefix, value: np.ndarray
+    """
+    with open(file, 'rb') as f:
+        data = f.read()
+    offset = 0
+
+    def read(fmt):
+        nonlocal offset
+        value = struct.unpack_from(fmt, data, offset)
+        offset += struct.calcsize(fmt)
+        return value
+
+    magic, _, count = read('<QQQ')
+    if magic != NDARRAY_LIST_MAGIC:
+        raise ScriptError(f'Not a mxnet params file: {file}')
+    arrays = []
+    for _ in range(count):
+        magic, = read('<I')
+        if magic not in [NDARRAY_V2_MAGIC, NDARRAY_V3_MAGIC]:
+            raise ScriptError(f'Unsupported NDArray format {hex(magic)} in {file}')
+        storage_type, = read('<i')
+        if storage_type != 0:
+            raise ScriptError(f'Sparse NDArray is not supported in {file}')
+        ndim, = read('<I')
+        shape = read(f'<{ndim}q')
+        # Context, dev_type and dev_id
+        read('<ii')
+        type_flag, = read('<i')
+        dtype = np.dtype(MXNET_DTYPE[type_flag])
+        size = int(np.prod(shape))
+        array = np.frombuffer(data, dtype=dtype, count=size, offset=offset).reshape(shape)
+        offset += size * dtype.itemsize
+        arrays.append(array)
+
+    count, = read('<Q')
+    names = []
+    for _ in range(count):
+        length, = read('<Q')
+        names.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+
+    return {name.split(':', 1)[-1]: array for name, array in zip(names, arrays)}
+
+
+def read_charset(file):
+    """
+    Same as `cnocr.utils.read_charset`, index 0 is reserved for CTC blank.
+    """
+    alphabet = [None]
+    with open(file, encoding='utf-8') as f:
+        for line in f:
+            alphabet.append(line.rstrip('\n'))
+    if '<space>' in alphabet:
+        alphabet[alphabet.index('<space>')] = ' '
+    inv_alph_dict = {char: index for index, char in enumerate(alphabet)}
+    return alphabet, inv_alph_dict
+
+
+def ctc_label(class_ids):
+    """
+    Same as `cnocr.fit.ctc_metrics.CtcMetrics.ctc_label`.
+
+    Args:
+        class_ids (list[int]):
+
+    Returns:
+        list[int], list[tuple[int]]: Label ids, start and end index of each label.
+    """
+    ret = []
+    previous = 0
+    for index, current in enumerate(class_ids):
+        if (current == 0 or current != previous) and previous != 0 and len(ret) > 0:
+            ret[-1][-1] = index
+        if current != 0 and current != previous:
+            ret.append([current, index, -1])
+        previous = current
+    if len(ret) == 0:
+        return [], []
+    if ret[-1][-1] < 0:
+        ret[-1][-1] = len(class_ids)
+    return [r[0] for r in ret], [(r[1], r[2]) for r in ret]
+
+
+def mxnet_reshape(shape, target):
+    """
+    Reshape with mxnet special values, 0, -1, -2, -3, -4.
+    https://mxnet.apache.org/versions/1.6/api/python/docs/api/ndarray/ndarray.html#mxnet.ndarray.reshape
+
+    Args:
+        shape (tuple[int]): Input shape
+        target (tuple[int]): Reshape argument
+
+    Returns:
+        tuple[int]: Output shape, may contain -1 which is inferred by numpy.
+    """
+    out = []
+    i = 0
+    j = 0
+    while j < len(target):
+        code = target[j]
+        if code == 0:
+            out.append(shape[i])
+            i += 1
+        elif code == -1:
+            out.append(-1)
+            i += 1
+        elif code == -2:
+            out += list(shape[i:])
+            i = len(shape)
+        elif code == -3:
+            out.append(shape[i] * shape[i + 1])
+            i += 2
+        elif code == -4:
+            d1, d2 = target[j + 1], target[j + 2]
+            if d1 == -1:
+                d1 = shape[i] // d2
+            if d2 == -1:
+                d2 = shape[i] // d1
+            out += [d1, d2]
+            i += 1
+            j += 2
+        else:
+            out.append(code)
+            i += 1
+        j += 1
+    return tuple(out)
+
+
+def sigmoid(x):
+    return 1. / (1. + np.exp(-x))
+
+
+class NumpyNetwork:
+    """
+    Forward pass of a cnocr densenet-lite-gru network in numpy.
+    Operators are interpreted from the mxnet symbol json, so models with different charsets share the same code.
+    """
+
+    def __init__(self, symbol_file, params_file, output='pred_fc'):
+        """
+        Args:
+            symbol_file (str): `*-symbol.json`
+            params_file (str): `*-0015.params`
+            output (str): Name of the output node, softmax will be applied on it.
+        """
+        with open(symbol_file, 'r', encoding='utf-8') as f:
+            self.nodes = json.load(f)['nodes']
+        self.params = load_mxnet_params(params_file)
+        self.output = output
+        if output not in [node['name'] for node in self.nodes]:
+            raise ScriptError(f'Output node {output} not found in {symbol_file}')
+
+        # Pre-compute scale and shift of batch normalization
+        self.batchnorm = {}
+        for node in self.nodes:
+            if node['op'] == 'BatchNorm':
+                name = node['name'][:-len('_fwd')] if node['name'].endswith('_fwd') else node['name']
+                eps = float(node['attrs'].get('eps', 1e-3))
+                scale = self.params[f'{name}_gamma'] / np.sqrt(self.params[f'{name}_running_var'] + eps)
+                shift = self.params[f'{name}_beta'] - self.params[f'{name}_running_mean'] * scale
+                self.batchnorm[node['name']] = (
+                    scale.astype(np.float32)[:, None, None], shift.astype(np.float32)[:, None, None])
+
+        # Parse attributes once, they are strings in symbol json
+        for node in self.nodes:
+            node['parsed'] = {}
+            for key, value in node.get('attrs', {}).items():
+                try:
+                    node['parsed'][key] = ast.literal_eval(value)
+                except (ValueError, SyntaxError):
+                    node['parsed'][key] = value
+
+    @staticmethod
+    def attr(node, key, default=None):
+        value = node['parsed'].get(key, None)
+        if value is None:
+            return default
+        return value
+
+    def forward(self, data):
+        """
+        Args:
+            data (np.ndarray): Shape (batch_size, 1, height, width), float32 in 0-1.
+
+        Returns:
+            np.ndarray: Probabilities in shape (seq_length * batch_size, num_classes)
+        """
+        values = []
+        for node in self.nodes:
+            op = node['op']
+            inputs = [values[i[0]] for i in node['inputs']]
+            if op == 'null':
+                if node['name'] == 'data':
+                    values.append(data)
+                else:
+                    values.append(self.params.get(node['name'], None))
+            elif op == 'Convolution':
+                values.append(self.convolution(node, inputs[0], inputs[1], inputs[2] if len(inputs) > 2 else None))
+            elif op == 'BatchNorm':
+                scale, shift = self.batchnorm[node['name']]
+                values.append(inputs[0] * scale + shift)
+            elif op == 'Activation':
+                act_type = node['attrs']['act_type']
+                if act_type == 'relu':
+                    values.append(np.maximum(inputs[0], 0))
+                elif act_type == 'sigmoid':
+                    values.append(sigmoid(inputs[0]))
+                elif act_type == 'tanh':
+                    values.append(np.tanh(inputs[0]))
+                else:
+                    raise ScriptError(f'Unsupported activation: {act_type}')
+            elif op == 'Concat':
+                values.append(np.concatenate(inputs, axis=self.attr(node, 'dim', 1)))
+            elif op == 'Pooling':
+                values.append(self.pooling(node, inputs[0]))
+            elif op == 'Reshape':
+                target = self.attr(node, 'shape')
+                if isinstance(target, int):
+                    target = (target,)
+                values.append(inputs[0].reshape(mxnet_reshape(inputs[0].shape, target)))
+            elif op == 'expand_dims':
+                values.append(np.expand_dims(inputs[0], self.attr(node, 'axis')))
+            elif op == 'squeeze':
+                values.append(np.squeeze(inputs[0], axis=self.attr(node, 'axis')))
+            elif op == 'transpose':
+                values.append(np.transpose(inputs[0], self.attr(node, 'axes')))
+            elif op in ['Dropout', 'BlockGrad']:
+                # Identity in inference
+                values.append(inputs[0])
+            elif op == '_rnn_param_concat':
+                values.append(np.concatenate([i.ravel() for i in inputs]))
+            elif op == '_zeros':
+                # Initial state of RNN, created in `rnn()`
+                values.append(None)
+            elif op == 'RNN':
+                values.append(self.rnn(node, inputs[0], inputs[1]))
+            elif op == 'FullyConnected':
+                x = inputs[0].reshape(inputs[0].shape[0], -1)
+                x = x @ inputs[1].T
+                if len(inputs) > 2:
+                    x += inputs[2]
+                values.append(x)
+            else:
+                raise ScriptError(f'Unsupported operator: {op}')
+
+            if node['name'] == self.output:
+                return self.softmax(values[-1])
+
+        raise ScriptError(f'Output node {self.output} not reached')
+
+    @staticmethod
+    def softmax(x):
+        x = np.exp(x - np.max(x, axis=-1, keepdims=True))
+        return x / np.sum(x, axis=-1, keepdims=True)
+
+    def convolution(self, node, x, weight, bias=None):
+        kh, kw = self.attr(node, 'kernel')
+        sh, sw = self.attr(node, 'stride', (1, 1))
+        ph, pw = self.attr(node, 'pad', (0, 0))
+        group = self.attr(node, 'num_group', 1)
+        if self.attr(node, 'dilate', (1, 1)) != (1, 1):
+            raise ScriptError('Dilated convolution is not supported')
+
+        if ph or pw:
+            x = np.pad(x, ((0, 0), (0, 0), (ph, ph), (pw, pw)), mode='constant')
+        n, c, h, w = x.shape
+        oh = (h - kh) // sh + 1
+        ow = (w - kw) // sw + 1
+        patches = [x[:, :, i:i + sh * (oh - 1) + 1:sh, j:j + sw * (ow - 1) + 1:sw]
+                   for i in range(kh) for j in range(kw)]
+
+        if group == 1:
+            if len(patches) == 1:
+                cols = patches[0].reshape(n, c, oh * ow)
+            else:
+                # im2col, (n, c, kh * kw, oh, ow), the same order as weight (out, c, kh, kw)
+                cols = np.stack(patches, axis=2).reshape(n, c * kh * kw, oh * ow)
+            out = np.matmul(weight.reshape(weight.shape[0], -1), cols).reshape(n, -1, oh, ow)
+        elif group == c and weight.shape[0] == c:
+            # Depthwise
+            kernel = weight.reshape(c, kh * kw)
+            out = np.zeros((n, c, oh, ow), dtype=np.float32)
+            for index, patch in enumerate(patches):
+                out += patch * kernel[:, index][:, None, None]
+        else:
+            raise ScriptError(f'Unsupported convolution group: {group}')
+
+        if bias is not None:
+            out += bias[:, None, None]
+        return out
+
+    def pooling(self, node, x):
+        kh, kw = self.attr(node, 'kernel')
+        if self.attr(node, 'stride', (1, 1)) != (kh, kw) or self.attr(node, 'pad', (0, 0)) != (0, 0):
+            raise ScriptError('Only non-overlapping pooling without padding is supported')
+        pool_type = self.attr(node, 'pool_type', 'max')
+        n, c, h, w = x.shape
+        oh, ow = h // kh, w // kw
+        # Element-wise on strided slices is much faster than reducing on a 6-dim view
+        patches = [x[:, :, i:oh * kh:kh, j:ow * kw:kw] for i in range(kh) for j in range(kw)]
+        if pool_type == 'max':
+            out = patches[0].copy()
+            for patch in patches[1:]:
+                np.maximum(out, patch, out=out)
+            return out
+        elif pool_type == 'avg':
+            return np.sum(patches, axis=0) / len(patches)
+        else:
+            raise ScriptError(f'Unsupported pooling: {pool_type}')
+
+    def rnn(self, node, x, params):
+        """
+        Fused mxnet GRU, single layer.
+
+        Args:
+            x (np.ndarray): Shape (seq_length, batch_size, input_size)
+            params (np.ndarray): Flatten parameters in mxnet order,
+                i2h and h2h weights of each direction, then i2h and h2h bias of each direction.
+
+        Returns:
+            np.ndarray: Shape (seq_length, batch_size, hidden * directions)
+        """
+        if self.attr(node, 'mode') != 'gru' or self.attr(node, 'num_layers', 1) != 1:
+            raise ScriptError('Only single layer GRU is supported')
+        hidden = self.attr(node, 'state_size')
+        directions = 2 if self.attr(node, 'bidirectional', False) else 1
+        seq_length, batch_size, input_size = x.shape
+
+        offset = 0
+        weights = []
+        for _ in range(directions):
+            i2h = params[offset:offset + 3 * hidden * input_size].reshape(3 * hidden, input_size)
+            offset += 3 * hidden * input_size
+            h2h = params[offset:offset + 3 * hidden * hidden].reshape(3 * hidden, hidden)
+            offset += 3 * hidden * hidden
+            weights.append([i2h, h2h])
+        for index in range(directions):
+            weights[index].append(params[offset:offset + 3 * hidden])
+            offset += 3 * hidden
+            weights[index].append(params[offset:offset + 3 * hidden])
+            offset += 3 * hidden
+
+        outputs = []
+        for direction, (i2h, h2h, i2h_bias, h2h_bias) in enumerate(weights):
+            # Input projection of all time steps at once
+            gates_x = (x.reshape(-1, input_size) @ i2h.T + i2h_bias).reshape(seq_length, batch_size, 3 * hidden)
+            h = np.zeros((batch_size, hidden), dtype=np.float32)
+            out = np.zeros((seq_length, batch_size, hidden), dtype=np.float32)
+            steps = range(seq_length) if direction == 0 else reversed(range(seq_length))
+            for t in steps:
+                gates_h = h @ h2h.T + h2h_bias
+                # Gate order in mxnet: reset, update, new
+                r = sigmoid(gates_x[t, :, :hidden] + gates_h[:, :hidden])
+                z = sigmoid(gates_x[t, :, hidden:2 * hidden] + gates_h[:, hidden:2 * hidden])
+                n = np.tanh(gates_x[t, :, 2 * hidden:] + r * gates_h[:, 2 * hidden:])
+                h = (1 - z) * n + z * h
+                out[t] = h
+            outputs.append(out)
+
+        return np.concatenate(outputs, axis=-1)
+
+
+class NumpyOcr:
+    """
+    Run cnocr models in numpy, without importing mxnet.
+    Has the same interface as AlOcr, and reads the same model files in ./bin/cnocr_models.
+    """
+    MODEL_FILE_PREFIX = 'cnocr-v1.2.0'
+    # Same as AlOcr, numpy runs on cpu only
+    CNOCR_CONTEXT = 'cpu'
+    # Input height of densenet-lite-gru
+    IMG_HEIGHT = 32
+    # Width compression ratio of densenet-lite-gru
+    SEQ_LEN_CMPR_RATIO = 4
+
+    def __init__(
+            self,
+            model_name='densenet-lite-gru',
+            model_epoch=None,
+            cand_alphabet=None,
+            root='',
+            context='cpu',
+            name=None,
+    ):
+        self._args = (model_name, model_epoch, cand_alphabet, root, context, name)
+        self._model_loaded = False
+
+    def init(self,
+             model_name='densenet-lite-gru',
+             model_epoch=None,
+             cand_alphabet=None,
+             root='',
+             context='cpu',
+             name=None,
+             ):
+        if model_name != 'densenet-lite-gru':
+            raise ScriptError(f'Model {model_name} is not supported in numpy OCR backend')
+        self._model_name = model_name
+        self._model_file_prefix = '{}-{}'.format(self.MODEL_FILE_PREFIX, model_name)
+        self._model_epoch = model_epoch
+        self._model_dir = root
+        self._assert_and_prepare_model_files()
+        self._alphabet, self._inv_alph_dict = read_charset(os.path.join(self._model_dir, 'label_cn.txt'))
+        self._cand_alph_idx = None
+
+        logger.info('Loading OCR model: %s' % self._model_dir)
+        prefix = os.path.join(self._model_dir, self._model_file_prefix)
+        self._net = NumpyNetwork(
+            symbol_file='%s-symbol.json' % prefix,
+            params_file='%s-%04d.params' % (prefix, self._model_epoch),
+        )
+        self._model_loaded = True
+
+    def _assert_and_prepare_model_files(self):
+        model_files = [
+            'label_cn.txt',
+            '%s-%04d.params' % (self._model_file_prefix, self._model_epoch),
+            '%s-symbol.json' % self._model_file_prefix,
+        ]
+        for f in model_files:
+            if not os.path.exists(os.path.join(self._model_dir, f)):
+                logger.warning(f'Ocr model not prepared: {self._model_dir}')
+                logger.warning(f'Required files: {model_files}')
+                logger.critical('Please check if required files of pre-trained OCR model exist')
+                raise RequestHumanTakeover
+
+    def set_cand_alphabet(self, cand_alphabet):
+        if not self._model_loaded:
+            self.init(*self._args)
+
+        if cand_alphabet is None:
+            self._cand_alph_idx = None
+        else:
+            self._cand_alph_idx = [0] + [self._inv_alph_dict[word] for word in cand_alphabet]
+            self._cand_alph_idx.sort()
+
+    def _preprocess_img_array(self, img):
+        """
+        Args:
+            img (np.ndarray): Shape (height, width)
+
+        Returns:
+            np.ndarray: Shape (1, IMG_HEIGHT, new_width)
+        """
+        new_width = int(round(self.IMG_HEIGHT / img.shape[0] * img.shape[1]))
+        img = cv2.resize(img, (new_width, self.IMG_HEIGHT))
+        img = np.expand_dims(img, 0).astype('float32') / 255.0
+        return img
+
+    @staticmethod
+    def _pad_arrays(img_list):
+        img_widths = [img.shape[2] for img in img_list]
+        max_width = max(img_widths)
+        img_list = [np.pad(img, ((0, 0), (0, 0), (0, max_width - img.shape[2])), mode='constant')
+                    for img in img_list]
+        return img_list, img_widths
+
+    def ocr(self, img_fp):
+        """
+        Multi-line OCR is not implemented, image is treated as a single line.
+        """
+        if img_fp.ndim == 3:
+            img_fp = cv2.cvtColor(img_fp, cv2.COLOR_RGB2GRAY)
+        if img_fp.mean() < 145:
+            img_fp = 255 - img_fp
+        return [self.ocr_for_single_line(img_fp)]
+
+    def ocr_for_single_line(self, img_fp):
+        return self.ocr_for_single_lines([img_fp])[0]
+
+    def ocr_for_single_lines(self, img_list, confidence=False):
+        if not self._model_loaded:
+            self.init(*self._args)
+        if len(img_list) == 0:
+            return []
+
+        img_list = [self._preprocess_img_array(img) for img in img_list]
+        img_list, img_widths = self._pad_arrays(img_list)
+        return self.ocr_for_batch(np.array(img_list), img_widths, confidence=confidence)
+
+    def ocr_for_batch(self, batch, img_widths, confidence=False):
+        """
+        See AlOcr.ocr_for_batch()
+        """
+        if not self._model_loaded:
+            self.init(*self._args)
+
+        batch_size = len(img_widths)
+        if batch_size == 0:
+            return []
+
+        prob = self._net.forward(np.asarray(batch, dtype=np.float32))
+        # [seq_len, batch_size, num_classes]
+        prob = np.reshape(prob, (-1, batch_size, prob.shape[1]))
+
+        if self._cand_alph_idx is not None:
+            mask = np.zeros(prob.shape[-1], dtype=np.float32)
+            mask[self._cand_alph_idx] = 1
+            prob = prob * mask
+
+        max_width = max(img_widths)
+        result = [self._gen_line_pred_result(prob[:, i, :], img_widths[i], max_width) for i in range(batch_size)]
+        if confidence:
+            return result
+        else:
+            return [r[0] for r in result]
+
+    def _gen_line_pred_result(self, line_prob, img_width, max_img_width):
+        """
+        See AlOcr._gen_line_pred_result()
+        """
+        class_ids = np.argmax(line_prob, axis=-1)
+        max_prob = np.max(line_prob, axis=-1)
+
+        class_ids *= max_prob > 0.5  # Delete low confidence result
+
+        end_idx = len(class_ids)
+        if img_width < max_img_width:
+            end_idx = min(img_width // self.SEQ_LEN_CMPR_RATIO, end_idx)
+            class_ids[end_idx:] = 0
+        prediction, start_end_idx = ctc_label(class_ids.tolist())
+        alphabet = self._alphabet
+        res = [alphabet[p] if alphabet[p] != '<space>' else ' ' for p in prediction]
+        probs = [float(np.max(line_prob[start:end, p])) for p, (start, end) in zip(prediction, start_end_idx)]
+        deleted = max_prob[:end_idx][max_prob[:end_idx] <= 0.5]
+        line_confidence = float(min(probs + deleted.tolist(), default=1.))
+
+        return [res, probs, line_confidence]
+
+    def debug(self, img_list):
+        """
+        Args:
+            img_list: List of numpy array, (height, width)
+        """
+        img_list = [(self._preprocess_img_array(img) * 255.0).astype(np.uint8) for img in img_list]
+        img_list, img_widths = self._pad_arrays(img_list)
+        image = cv2.hconcat(img_list)[0, :, :]
+        Image.fromarray(image).show()
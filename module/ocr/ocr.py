@@ -17,8 +17,31 @@ else:
     OCR_MODEL = ModelProxyFactory()
 
 
+class OcrResult:
+    def __init__(self, chars, probs, confidence):
+        """
+        Args:
+            chars (list[str]): ['1', '4', '/', '1', '5']
+            probs (list[float]): Probability of each character.
+            confidence (float): Line confidence, 0 to 1.
+        """
+        self.chars = chars
+        self.probs = probs
+        self.confidence = confidence
+
+    def __str__(self):
+        return f'{"".join(self.chars)} ({float2str(self.confidence, decimal=2)})'
+
+    __repr__ = __str__
+
+
 class Ocr:
     SHOW_LOG = True
+    # Results with line confidence lower than this will be read again on the same image,
+    # using `pre_process_alternate`. 0 to disable.
+    REREAD_CONFIDENCE = 0.
+    # Input height of densenet-lite-gru models, images are resized to this height before feeding.
+    MODEL_IMAGE_HEIGHT = 32
 
     def __init__(self, buttons, lang='azur_lane', letter=(255, 255, 255), threshold=128, alphabet=None, name=None):
         """
@@ -51,9 +74,85 @@ class Ocr:
             np.ndarray: Shape (width, height)
         """
         image = extract_letters(image, letter=self.letter, threshold=self.threshold)
+        image = self.after_extract(image.astype(np.uint8))
 
         return image.astype(np.uint8)
 
+    def after_extract(self, image):
+        """
+        Crop or pad letters after `extract_letters`.
+        Override this instead of `pre_process`, so images can still be preprocessed in batch.
+
+        Args:
+            image (np.ndarray): Shape (width, height), black letters on white background.
+
+        Returns:
+            np.ndarray: Shape (width, height)
+        """
+        return image
+
+    def pre_process_alternate(self, image):
+        """
+        Preprocess for re-reading low confidence results.
+        Default to `pre_process` with white padding on both sides,
+        letters touching image edges are a common cause of poor OCR.
+
+        Args:
+            image (np.ndarray): Shape (height, width, channel)
+
+        Returns:
+            np.ndarray: Shape (width, height)
+        """
+        image = self.pre_process(image)
+        image = np.pad(image, ((2, 2), (2, 2)), mode='constant', constant_values=255)
+        return image
+
+    @property
+    def batch_pre_process_available(self):
+        """
+        Batched preprocessing reproduces `Ocr.pre_process` and `after_extract`,
+        subclasses that override `pre_process` are processed one by one.
+        """
+        return type(self).pre_process is Ocr.pre_process
+
+    def pre_process_batch(self, image_list):
+        """
+        Extract letters from all images in one pass and write them into model input layout.
+
+        Images are stacked vertically into one canvas, so `extract_letters` runs once instead of once per image.
+        Then each result is resized to model height and copied into a zero padded tensor,
+        which is the same as what cnocr does in `_preprocess_img_array` and `_pad_arrays`.
+
+        Args:
+            image_list (list[np.ndarray]): Images in shape (height, width, channel)
+
+        Returns:
+            np.ndarray, list[int]: Model input in shape (n, 1, MODEL_IMAGE_HEIGHT, max_width), float32 in 0-1.
+                Width of each image after resizing.
+        """
+        heights = [image.shape[0] for image in image_list]
+        canvas = np.zeros((sum(heights), max([image.shape[1] for image in image_list]), 3), dtype=np.uint8)
+        y = 0
+        for image, height in zip(image_list, heights):
+            canvas[y:y + height, :image.shape[1]] = image
+            y += height
+        canvas = extract_letters(canvas, letter=self.letter, threshold=self.threshold).astype(np.uint8)
+        letters_list = []
+        y = 0
+        for image, height in zip(image_list, heights):
+            letters = self.after_extract(canvas[y:y + height, :image.shape[1]])
+            letters_list.append(letters.astype(np.uint8))
+            y += height
+
+        height = self.MODEL_IMAGE_HEIGHT
+        widths = [int(round(height / letters.shape[0] * letters.shape[1])) for letters in letters_list]
+        batch = np.zeros((len(image_list), 1, height, max(widths)), dtype=np.float32)
+        for index, (letters, width) in enumerate(zip(letters_list, widths)):
+            batch[index, 0, :, :width] = cv2.resize(letters, (width, height))
+        batch /= 255.0
+
+        return batch, widths
+
     def after_process(self, result):
         """
         Args:
@@ -70,28 +169,60 @@ class Ocr:
 
         return result
 
-    def ocr(self, image, direct_ocr=False):
+    def ocr_result(self, image, direct_ocr=False):
         """
         Args:
             image (np.ndarray, list[np.ndarray]):
-            direct_ocr (bool): True to skip preprocess.
+            direct_ocr (bool): True to ocr on a list of images instead of cropping `self.buttons`.
 
         Returns:
-
+            list[OcrResult]:
         """
-        start_time = time.time()
-
         self.cnocr.set_cand_alphabet(self.alphabet)
         if direct_ocr:
-            image_list = [self.pre_process(i) for i in image]
+            image_list = image
         else:
-            image_list = [self.pre_process(crop(image, area)) for area in self.buttons]
+            image_list = [crop(image, area) for area in self.buttons]
 
-        # This will show the images feed to OCR model
-        # self.cnocr.debug(image_list)
+        if not len(image_list):
+            return []
+        elif self.batch_pre_process_available:
+            batch, widths = self.pre_process_batch(image_list)
+            result_list = self.cnocr.ocr_for_batch(batch, widths, confidence=True)
+        else:
+            processed = [self.pre_process(i) for i in image_list]
 
-        result_list = self.cnocr.ocr_for_single_lines(image_list)
-        result_list = [self.after_process(result) for result in result_list]
+            # This will show the images feed to OCR model
+            # self.cnocr.debug(processed)
+
+            result_list = self.cnocr.ocr_for_single_lines(processed, confidence=True)
+        result_list = [OcrResult(*result) for result in result_list]
+
+        # Read low confidence results again on the same image
+        reread = [index for index, result in enumerate(result_list) if result.confidence < self.REREAD_CONFIDENCE]
+        if reread:
+            processed = [self.pre_process_alternate(image_list[index]) for index in reread]
+            for index, result in zip(reread, self.cnocr.ocr_for_single_lines(processed, confidence=True)):
+                result = OcrResult(*result)
+                logger.info(f'{self.name} re-read: {result_list[index]} -> {result}')
+                if result.confidence > result_list[index].confidence:
+                    result_list[index] = result
+
+        return result_list
+
+    def ocr(self, image, direct_ocr=False):
+        """
+        Args:
+            image (np.ndarray, list[np.ndarray]):
+            direct_ocr (bool): True to ocr on a list of images instead of cropping `self.buttons`.
+
+        Returns:
+
+        """
+        start_time = time.time()
+
+        result_list = self.ocr_result(image, direct_ocr=direct_ocr)
+        result_list = [self.after_process(result.chars) for result in result_list]
 
         if len(self.buttons) == 1:
             result_list = result_list[0]
@@ -120,6 +251,8 @@ class Digit(Ocr):
 
 
 class DigitCounter(Ocr):
+    REREAD_CONFIDENCE = 0.8
+
     def __init__(self, buttons, lang='azur_lane', letter=(255, 255, 255), threshold=128, alphabet='0123456789/',
                  name=None):
         super().__init__(buttons, lang=lang, letter=letter, threshold=threshold, alphabet=alphabet, name=name)
@@ -150,6 +283,8 @@ class DigitCounter(Ocr):
 
 
 class Duration(Ocr):
+    REREAD_CONFIDENCE = 0.8
+
     def __init__(self, buttons, lang='azur_lane', letter=(255, 255, 255), threshold=128, alphabet='0123456789:',
                  name=None):
         super().__init__(buttons, lang=lang, letter=letter, threshold=threshold, alphabet=alphabet, name=name)
@@ -1,7 +1,7 @@
 import argparse
 import multiprocessing
 import pickle
-from typing import List
+from typing import TYPE_CHECKING, List
 
 import numpy as np
 import zerorpc
@@ -10,6 +10,9 @@ import zmq
 from deploy.config import DeployConfig
 from module.logger import logger
 
+if TYPE_CHECKING:
+    from module.ocr.al_ocr import AlOcr
+
 
 class Config(DeployConfig):
     def show_config(self):
@@ -59,15 +62,25 @@ class ModelProxy:
         from module.ocr.models import OCR_MODEL
         return OCR_MODEL.__getattribute__(self.lang).ocr_for_single_line(img_fp)
 
-    def ocr_for_single_lines(self, img_list: List[np.ndarray]):
+    def ocr_for_single_lines(self, img_list: List[np.ndarray], confidence=False):
         if self.online:
             img_str_list = [img_fp.dumps() for img_fp in img_list]
             try:
-                return self.client("ocr_for_single_lines", self.lang, img_str_list)
+                return self.client("ocr_for_single_lines", self.lang, img_str_list, confidence)
             except:
                 self.online = False
         from module.ocr.models import OCR_MODEL
-        return OCR_MODEL.__getattribute__(self.lang).ocr_for_single_lines(img_list)
+        return OCR_MODEL.__getattribute__(self.lang).ocr_for_single_lines(img_list, confidence=confidence)
+
+    def ocr_for_batch(self, batch: np.ndarray, img_widths: List[int], confidence=False):
+        if self.online:
+            img_str = batch.dumps()
+            try:
+                return self.client("ocr_for_batch", self.lang, img_str, img_widths, confidence)
+            except:
+                self.online = False
+        from module.ocr.models import OCR_MODEL
+        return OCR_MODEL.__getattribute__(self.lang).ocr_for_batch(batch, img_widths, confidence=confidence)
 
     def set_cand_alphabet(self, cand_alphabet: str):
         if self.online:
@@ -100,7 +113,6 @@ class ModelProxyFactory:
 
 
 def start_ocr_server(port=22268):
-    from module.ocr.al_ocr import AlOcr
     from module.ocr.models import OcrModel
 
     class OCRServer(OcrModel):
@@ -117,10 +129,15 @@ def start_ocr_server(port=22268):
             cnocr: AlOcr = self.__getattribute__(lang)
             return cnocr.ocr_for_single_line(img_fp)
 
-        def ocr_for_single_lines(self, lang, img_list):
+        def ocr_for_single_lines(self, lang, img_list, confidence=False):
             img_list = [pickle.loads(img_fp) for img_fp in img_list]
             cnocr: AlOcr = self.__getattribute__(lang)
-            return cnocr.ocr_for_single_lines(img_list)
+            return cnocr.ocr_for_single_lines(img_list, confidence=confidence)
+
+        def ocr_for_batch(self, lang, batch, img_widths, confidence=False):
+            batch = pickle.loads(batch)
+            cnocr: AlOcr = self.__getattribute__(lang)
+            return cnocr.ocr_for_batch(batch, img_widths, confidence=confidence)
 
         def set_cand_alphabet(self, lang, cand_alphabet):
             cnocr: AlOcr = self.__getattribute__(lang)
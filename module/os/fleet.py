@@ -4,6 +4,7 @@ import inflection
 import numpy as np
 
 from module.base.button import Button, ButtonGrid
+from module.base.decorator import cached_property
 from module.base.filter import Filter
 from module.base.timer import Timer
 from module.base.utils import point_limit
@@ -17,6 +18,7 @@ from module.ocr.ocr import Ocr
 from module.os.assets import MAP_GOTO_GLOBE, STRONGHOLD_PERCENTAGE, TEMPLATE_EMPTY_HP, FLEET_EMP_DEBUFF
 from module.os.camera import OSCamera
 from module.os.map_base import OSCampaignMap
+from module.os.motion import MotionDetector
 from module.os_ash.ash import OSAsh
 from module.os_combat.combat import Combat
 from module.os_handler.assets import CLICK_SAFE_AREA, IN_MAP, PORT_ENTER, PORT_SUPPLY_CHECK
@@ -48,8 +50,7 @@ class PercentageOcr(Ocr):
         kwargs['lang'] = 'azur_lane'
         super().__init__(*args, **kwargs)
 
-    def pre_process(self, image):
-        image = super().pre_process(image)
+    def after_extract(self, image):
         image = np.pad(image, ((2, 2), (0, 0)), mode='constant', constant_values=255)
         return image
 
@@ -210,6 +211,57 @@ class OSFleet(OSCamera, Combat, Fleet, OSAsh):
             center = self.camera
         return SelectedGrids(sea).sort_by_camera_distance(center)
 
+    @cached_property
+    def motion_detector(self):
+        """
+        Returns:
+            MotionDetector:
+        """
+        return MotionDetector(
+            area=self.config.OS_MOTION_AREA,
+            resize=self.config.OS_MOTION_RESIZE,
+            moving=self.config.OS_MOTION_MOVING,
+            still=self.config.OS_MOTION_STILL,
+            count=self.config.OS_MOTION_STILL_COUNT,
+        )
+
+    def motion_stable(self, confirm_timer, trust_motion=True, arrive_timer=None):
+        """
+        Args:
+            confirm_timer (Timer): Still frames need to last for confirm_timer, if motion not trusted.
+            trust_motion (bool): If stable as soon as motion stops.
+                If False, also wait confirm_timer, because something may appear after arrival.
+            arrive_timer (Timer): Predicted arrival. If no motion detected, still frames before arrival are not trusted,
+                because fleet may start walking late.
+
+        Returns:
+            bool: If stable.
+        """
+        motion = self.motion_detector
+        if motion.update(self.device.image):
+            if trust_motion and motion.has_moved:
+                logger.info(f'Motion stopped, diff={motion.diff}')
+                return True
+            if confirm_timer.reached() and (arrive_timer is None or arrive_timer.reached()):
+                return True
+        else:
+            confirm_timer.reset()
+        return False
+
+    def walk_predict_arrival(self, grid):
+        """
+        Args:
+            grid (OSGrid): Destination in local view.
+
+        Returns:
+            float: Predicted seconds for current fleet to walk to grid.
+        """
+        fleet = self.convert_radar_to_local((0, 0))
+        distance = np.sum(np.abs(np.subtract(grid.location, fleet.location)))
+        arrive = distance * self.config.OS_WALK_GRID_TIME
+        logger.attr('Predicted_arrival', f'{arrive:.1f}s')
+        return arrive
+
     def wait_until_camera_stable(self, skip_first_screenshot=True):
         """
         Wait until homo_loca stabled.
@@ -218,6 +270,21 @@ class OSFleet(OSCamera, Combat, Fleet, OSAsh):
         logger.hr('Wait until camera stable')
         record = None
         confirm_timer = Timer(0.6, count=2).start()
+        if self.config.OS_MOTION_DETECTION:
+            self.motion_detector.reset()
+            while 1:
+                if skip_first_screenshot:
+                    skip_first_screenshot = False
+                else:
+                    self.device.screenshot()
+
+                if self.motion_stable(confirm_timer):
+                    break
+
+            self.update_os()
+            logger.info('Camera stabled')
+            return
+
         while 1:
             if skip_first_screenshot:
                 skip_first_screenshot = False
@@ -237,7 +304,8 @@ class OSFleet(OSCamera, Combat, Fleet, OSAsh):
 
         logger.info('Camera stabled')
 
-    def wait_until_walk_stable(self, confirm_timer=None, skip_first_screenshot=False, walk_out_of_step=True, drop=None):
+    def wait_until_walk_stable(self, confirm_timer=None, skip_first_screenshot=False, walk_out_of_step=True, drop=None,
+                               arrive=None):
         """
         Wait until homo_loca stabled.
         DETECTION_BACKEND must be 'homography'.
@@ -248,6 +316,8 @@ class OSFleet(OSCamera, Combat, Fleet, OSAsh):
             walk_out_of_step (bool): If catch walk_out_of_step error.
                 Default to True, use False in abyssal zones.
             drop (DropImage):
+            arrive (float): Predicted seconds to arrive, from `walk_predict_arrival()`.
+                Only used in OS_MOTION_DETECTION.
 
         Returns：
             str: Things that fleet met on its way,
@@ -262,11 +332,16 @@ class OSFleet(OSCamera, Combat, Fleet, OSAsh):
         record = None
         enemy_searching_appear = False
         self.device.screenshot_interval_set(0.35)
+        # Stable as soon as motion stops, unless caller needs to wait something after arrival.
+        trust_motion = confirm_timer is None
         if confirm_timer is None:
             confirm_timer = Timer(0.8, count=2)
         result = set()
+        motion = self.config.OS_MOTION_DETECTION
+        arrive_timer = Timer(arrive).start() if motion and arrive else None
 
         confirm_timer.reset()
+        self.motion_detector.reset()
         while 1:
             if skip_first_screenshot:
                 skip_first_screenshot = False
@@ -276,10 +351,12 @@ class OSFleet(OSCamera, Combat, Fleet, OSAsh):
             # Map event
             if self.handle_map_event(drop=drop):
                 confirm_timer.reset()
+                self.motion_detector.reset()
                 result.add('event')
                 continue
             if self.handle_retirement():
                 confirm_timer.reset()
+                self.motion_detector.reset()
                 continue
             if self.handle_walk_out_of_step():
                 if walk_out_of_step:
@@ -291,6 +368,7 @@ class OSFleet(OSCamera, Combat, Fleet, OSAsh):
             if not enemy_searching_appear and self.enemy_searching_appear():
                 enemy_searching_appear = True
                 confirm_timer.reset()
+                self.motion_detector.reset()
                 continue
             else:
                 if enemy_searching_appear:
@@ -308,6 +386,7 @@ class OSFleet(OSCamera, Combat, Fleet, OSAsh):
                 # self.ui_back(check_button=self.is_in_map)
                 self.combat(expected_end=self.is_in_map, fleet_index=self.fleet_show_index, save_get_items=drop)
                 confirm_timer.reset()
+                self.motion_detector.reset()
                 result.add('event')
                 continue
 
@@ -316,12 +395,18 @@ class OSFleet(OSCamera, Combat, Fleet, OSAsh):
                 self.interval_clear(PORT_SUPPLY_CHECK)
                 self.handle_akashi_supply_buy(CLICK_SAFE_AREA)
                 confirm_timer.reset()
+                self.motion_detector.reset()
                 result.add('akashi')
                 continue
 
             # Arrive
             # Check colors, because screen goes black when something is unlocking.
             if self.is_in_map() and IN_MAP.match_appear_on(self.device.image):
+                if motion:
+                    if self.motion_stable(confirm_timer, trust_motion=trust_motion, arrive_timer=arrive_timer):
+                        self.update_os()
+                        break
+                    continue
                 self.update_os()
                 current = self.view.backend.homo_loca
                 logger.attr('homo_loca', current)
@@ -333,6 +418,7 @@ class OSFleet(OSCamera, Combat, Fleet, OSAsh):
                 record = current
             else:
                 confirm_timer.reset()
+                self.motion_detector.reset()
 
         result = '_'.join(result)
         logger.info(f'Walk stabled, result: {result}')
@@ -19,11 +19,15 @@ class GlobeCamera(GlobeOperation, ZoneManager):
             self.globe = GlobeDetection(self.config)
             self.globe.load_globe_map()
 
-    def globe_update(self):
+    def globe_update(self, hint=None):
+        """
+        Args:
+            hint (tuple): Expected globe camera, None to use the current one.
+        """
         self.device.screenshot()
 
         self._globe_init()
-        self.globe.load(self.device.image)
+        self.globe.load(self.device.image, hint=hint)
         self.globe_camera = self.globe.center_loca
         center = self.camera_to_zone(self.globe.center_loca)
         logger.attr('Globe_center', center.zone_id)
@@ -39,6 +43,7 @@ class GlobeCamera(GlobeOperation, ZoneManager):
         """
         name = 'GLOBE_SWIPE_' + '_'.join([str(int(round(x))) for x in vector])
         if np.any(np.abs(vector) > 25):
+            hint = tuple(np.add(self.globe_camera, vector))
             if self.config.DEVICE_CONTROL_METHOD == 'minitouch':
                 distance = self.config.MAP_SWIPE_MULTIPLY_MINITOUCH
             else:
@@ -49,7 +54,7 @@ class GlobeCamera(GlobeOperation, ZoneManager):
             self.device.swipe_vector(vector, name=name, box=box)
             self.device.sleep(0.3)
 
-            self.globe_update()
+            self.globe_update(hint=hint)
 
     def globe_wait_until_stable(self):
         prev = self.globe_camera
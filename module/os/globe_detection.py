@@ -1,3 +1,5 @@
+import hashlib
+import os
 import time
 
 from module.base.utils import *
@@ -9,6 +11,7 @@ from module.map_detection.utils import *
 
 GLOBE_MAP = './assets/map_detection/os_globe_map.png'
 GLOBE_MAP_SHAPE = (2570, 1696)
+GLOBE_MAP_CACHE_FOLDER = './log/cache'
 
 
 class GlobeDetection:
@@ -24,6 +27,7 @@ class GlobeDetection:
         0.062s      similarity: 0.354
     """
     globe = None
+    globe_coarse = None
     homo_center: tuple
     center_loca: tuple
 
@@ -47,13 +51,26 @@ class GlobeDetection:
         logger.info('Loading OS globe map')
 
         # Load GLOBE_MAP
-        image = load_image(GLOBE_MAP)
-        image = self.find_peaks(image, para=self.config.OS_GLOBE_FIND_PEAKS_PARAMETERS)
-        pad = self.config.OS_GLOBE_IMAGE_PAD
-        image = np.pad(image, ((pad, pad), (pad, pad)), mode='constant', constant_values=0)
-        image = image.astype(np.uint8)
-        image = cv2.resize(image, None, fx=self.config.OS_GLOBE_IMAGE_RESIZE, fy=self.config.OS_GLOBE_IMAGE_RESIZE)
+        cache = self.globe_cache_file()
+        if os.path.exists(cache):
+            image = load_image(cache)
+        else:
+            image = load_image(GLOBE_MAP)
+            image = self.find_peaks(image, para=self.config.OS_GLOBE_FIND_PEAKS_PARAMETERS)
+            pad = self.config.OS_GLOBE_IMAGE_PAD
+            image = np.pad(image, ((pad, pad), (pad, pad)), mode='constant', constant_values=0)
+            image = image.astype(np.uint8)
+            image = cv2.resize(image, None, fx=self.config.OS_GLOBE_IMAGE_RESIZE,
+                               fy=self.config.OS_GLOBE_IMAGE_RESIZE)
+            logger.info(f'Save OS globe map cache: {cache}')
+            os.makedirs(GLOBE_MAP_CACHE_FOLDER, exist_ok=True)
+            # Remove caches of other parameters
+            for file in os.listdir(GLOBE_MAP_CACHE_FOLDER):
+                if file.startswith('os_globe_map_') and file.endswith('.png'):
+                    os.remove(os.path.join(GLOBE_MAP_CACHE_FOLDER, file))
+            save_image(image, cache)
         self.globe = image
+        self.globe_coarse = self.resize_coarse(image)
 
         # Load homography
         backup = self.config.temporary(
@@ -65,6 +82,28 @@ class GlobeDetection:
         self._globe_map_loaded = True
         return True
 
+    def globe_cache_file(self):
+        """
+        Returns:
+            str: Cache file of the processed GLOBE_MAP.
+                File name changes if GLOBE_MAP or the parameters to process it change.
+        """
+        key = (os.stat(GLOBE_MAP).st_mtime, os.stat(GLOBE_MAP).st_size, self.config.OS_GLOBE_FIND_PEAKS_PARAMETERS,
+               self.config.OS_GLOBE_IMAGE_PAD, self.config.OS_GLOBE_IMAGE_RESIZE)
+        key = hashlib.md5(str(key).encode('utf-8')).hexdigest()[:8]
+        return os.path.join(GLOBE_MAP_CACHE_FOLDER, f'os_globe_map_{key}.png')
+
+    def resize_coarse(self, image):
+        """
+        Args:
+            image (np.ndarray): Globe map or local map, after OS_GLOBE_IMAGE_RESIZE.
+
+        Returns:
+            np.ndarray: Image for coarse search.
+        """
+        resize = self.config.OS_GLOBE_COARSE_RESIZE
+        return cv2.resize(image, None, fx=resize, fy=resize, interpolation=cv2.INTER_AREA)
+
     def screen2globe(self, points):
         return perspective_transform(points, data=self.homography.homo_data)
 
@@ -104,10 +143,81 @@ class GlobeDetection:
         image = cv2.warpPerspective(image, self.homography.homo_data, self.homography.homo_size)
         return image
 
-    def load(self, image):
+    def match_around(self, local, loca, radius):
+        """
+        Match local map in a small area of globe map.
+        Results of TM_CCOEFF_NORMED only depend on the image under template,
+        so it's the same as matching the whole globe map, if the best match is inside this area.
+
+        Args:
+            local (np.ndarray): Local map, after OS_GLOBE_IMAGE_RESIZE.
+            loca (tuple, np.ndarray): Expected upper-left corner of local map on globe map.
+            radius (int): Search radius, in pixels of globe map.
+
+        Returns:
+            float, np.ndarray: Similarity, and upper-left corner of local map on globe map.
+                Similarity is 0 if the best match is on the edge of search area,
+                which means the actual one might be outside.
+        """
+        h, w = local.shape
+        x1, y1 = np.maximum(np.round(loca).astype(int) - radius, 0)
+        x2, y2 = np.minimum(np.round(loca).astype(int) + radius + (w, h), self.globe.shape[::-1])
+        if x2 - x1 < w or y2 - y1 < h:
+            return 0., np.array(loca)
+
+        result = cv2.matchTemplate(self.globe[y1:y2, x1:x2], local, cv2.TM_CCOEFF_NORMED)
+        _, similarity, _, best = cv2.minMaxLoc(result)
+        # Edges of globe map are real edges, not the edges of search area.
+        on_edge = (best[0] == 0 and x1 > 0) or (best[1] == 0 and y1 > 0) \
+            or (best[0] == result.shape[1] - 1 and x2 < self.globe.shape[1]) \
+            or (best[1] == result.shape[0] - 1 and y2 < self.globe.shape[0])
+        if on_edge:
+            similarity = 0.
+        return similarity, np.add(best, (x1, y1))
+
+    def match(self, local, hint=None):
+        """
+        Args:
+            local (np.ndarray): Local map, after OS_GLOBE_IMAGE_RESIZE.
+            hint (tuple): Expected center_loca, such as the last center_loca or the target zone location.
+                None to search the whole globe map.
+
+        Returns:
+            float, np.ndarray: Similarity, and upper-left corner of local map on globe map.
+        """
+        resize = self.config.OS_GLOBE_IMAGE_RESIZE
+        threshold = self.config.OS_GLOBE_SEARCH_SIMILARITY
+
+        # Coarse search on the whole globe map, then fine search near the coarse result.
+        coarse = self.config.OS_GLOBE_COARSE_RESIZE
+        result = cv2.matchTemplate(self.globe_coarse, self.resize_coarse(local), cv2.TM_CCOEFF_NORMED)
+        _, _, _, loca = cv2.minMaxLoc(result)
+        similarity, loca = self.match_around(local, np.array(loca) / coarse, radius=int(np.ceil(2 / coarse)))
+
+        # Fine search near hint.
+        # A wrong hint may have a local peak, so it's accepted only if it beats the coarse result.
+        if hint is not None:
+            hint_loca = (np.array(hint) - self.homo_center + self.config.OS_GLOBE_IMAGE_PAD) * resize
+            hint_similarity, hint_loca = self.match_around(
+                local, hint_loca, radius=int(self.config.OS_GLOBE_SEARCH_RADIUS * resize))
+            if hint_similarity > similarity:
+                similarity, loca = hint_similarity, hint_loca
+
+        if similarity >= threshold:
+            return similarity, loca
+
+        # Full search
+        logger.info('Globe coarse search failed, search the whole globe map')
+        result = cv2.matchTemplate(self.globe, local, cv2.TM_CCOEFF_NORMED)
+        _, similarity, _, loca = cv2.minMaxLoc(result)
+        return similarity, np.array(loca)
+
+    def load(self, image, hint=None):
         """
         Args:
             image (np.ndarray):
+            hint (tuple): Expected center_loca, such as the last center_loca or the target zone location.
+                None to use the last center_loca.
         """
         self.load_globe_map()
         start_time = time.time()
@@ -116,8 +226,9 @@ class GlobeDetection:
         local = local.astype(np.uint8)
         local = cv2.resize(local, None, fx=self.config.OS_GLOBE_IMAGE_RESIZE, fy=self.config.OS_GLOBE_IMAGE_RESIZE)
 
-        result = cv2.matchTemplate(self.globe, local, cv2.TM_CCOEFF_NORMED)
-        _, similarity, _, loca = cv2.minMaxLoc(result)
+        if hint is None:
+            hint = getattr(self, 'center_loca', None)
+        similarity, loca = self.match(local, hint=hint)
         loca = np.array(loca) / self.config.OS_GLOBE_IMAGE_RESIZE
         loca = tuple(self.homo_center + loca - self.config.OS_GLOBE_IMAGE_PAD)
         self.center_loca = loca
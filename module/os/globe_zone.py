@@ -69,6 +69,57 @@ class ZoneManager:
         """
         return SelectedGrids([Zone(zone_id, info) for zone_id, info in DIC_OS_MAP.items()])
 
+    @cached_property
+    def zone_id_index(self):
+        """
+        Returns:
+            dict: Key: zone_id, Value: Zone.
+        """
+        return {zone.zone_id: zone for zone in self.zones}
+
+    @staticmethod
+    def zone_name_normalize(name):
+        return str(name).replace(' ', '').lower()
+
+    @cached_property
+    def zone_name_index(self):
+        """
+        Returns:
+            dict: Key: normalized name in CN/EN/JP/TW, Value: Zone.
+                If zones have the same name, the first one is used.
+        """
+        index = {}
+        for zone in self.zones:
+            for name in [zone.cn, zone.en, zone.jp, zone.tw]:
+                index.setdefault(self.zone_name_normalize(name), zone)
+        return index
+
+    @cached_property
+    def zone_location_index(self):
+        """
+        Returns:
+            dict: Key: region, None for all regions. Value: tuple[list[Zone], np.ndarray], zones and their locations.
+        """
+        index = {None: (list(self.zones), np.array(self.zones.location))}
+        for region in set(self.zones.get('region')):
+            zones = list(self.zones.select(region=region))
+            index[region] = (zones, np.array([zone.location for zone in zones]))
+        return index
+
+    @cached_property
+    def zone_port_table(self):
+        """
+        Returns:
+            dict: Key: zone_id, Value: list[Zone], azur ports in the order to choose.
+                Ports in the same region, then ports in other regions from near to far.
+        """
+        ports = self.zones.select(is_azur_port=True)
+        table = {}
+        for zone in self.zones:
+            same = [port for port in ports if port.region == zone.region]
+            table[zone.zone_id] = same + list(ports.sort_by_camera_distance(camera=tuple(zone.location)))
+        return table
+
     def camera_to_zone(self, camera, region=None):
         """
         Args:
@@ -78,12 +129,9 @@ class ZoneManager:
         Returns:
             Zone:
         """
-        if region is None:
-            zones = self.zones
-        else:
-            zones = self.zones.select(region=region)
-        zones = zones.sort_by_camera_distance(camera=camera)
-        return zones[0]
+        zones, location = self.zone_location_index[region]
+        diff = np.sum(np.abs(location - camera), axis=1)
+        return zones[int(np.argmin(diff))]
 
     def name_to_zone(self, name):
         """
@@ -102,30 +150,20 @@ class ZoneManager:
             return name
         elif isinstance(name, int):
             try:
-                return self.zones.select(zone_id=name)[0]
-            except IndexError:
+                return self.zone_id_index[name]
+            except KeyError:
                 raise ScriptError(f'Unable to find OS globe zone: {name}')
         elif isinstance(name, str) and name.isdigit():
             try:
-                return self.zones.select(zone_id=int(name))[0]
-            except IndexError:
+                return self.zone_id_index[int(name)]
+            except KeyError:
                 raise ScriptError(f'Unable to find OS globe zone: {name}')
         else:
-            def parse_name(n):
-                n = str(n).replace(' ', '').lower()
-                return n
-
-            name = parse_name(name)
-            for zone in self.zones:
-                if name == parse_name(zone.cn):
-                    return zone
-                if name == parse_name(zone.en):
-                    return zone
-                if name == parse_name(zone.jp):
-                    return zone
-                if name == parse_name(zone.tw):
-                    return zone
-            raise ScriptError(f'Unable to find OS globe zone: {name}')
+            name = self.zone_name_normalize(name)
+            try:
+                return self.zone_name_index[name]
+            except KeyError:
+                raise ScriptError(f'Unable to find OS globe zone: {name}')
 
     def zone_nearest_azur_port(self, zone):
         """
@@ -136,14 +174,10 @@ class ZoneManager:
             Zone:
         """
         zone = self.name_to_zone(zone)
-        ports = self.zones.select(is_azur_port=True).delete(SelectedGrids([self.zone]))
-        # In same region
-        for port in ports:
-            if zone.region == port.region:
+        # In same region, then in different region
+        for port in self.zone_port_table[zone.zone_id]:
+            if port != self.zone:
                 return port
-        # In different region
-        ports = ports.sort_by_camera_distance(camera=tuple(zone.location))
-        return ports[0]
 
     def zone_select(self, hazard_level):
         """
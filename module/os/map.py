@@ -1,4 +1,5 @@
 import inflection
+import numpy as np
 
 from module.base.button import Button
 from module.base.timer import Timer
@@ -7,6 +8,7 @@ from module.exception import CampaignEnd, RequestHumanTakeover
 from module.exception import MapWalkError, ScriptError
 from module.logger import logger
 from module.map.map import Map
+from module.map.map_base import location2node
 from module.os.assets import FLEET_EMP_DEBUFF
 from module.os.fleet import OSFleet
 from module.os.globe_camera import GlobeCamera
@@ -405,7 +407,7 @@ class OSMap(OSFleet, Map, GlobeCamera):
                     success = False
                     logger.warning('Fleet died, stop auto search')
                     continue
-            if self.handle_map_event():
+            if self.handle_map_event_dispatch():
                 # Auto search can not handle siren searching device.
                 continue
 
@@ -516,6 +518,69 @@ class OSMap(OSFleet, Map, GlobeCamera):
 
     _solved_map_event = set()
     _solved_fleet_mechanism = 0
+    # Camera locations that were rescanned without map events, since entering current map.
+    _map_rescan_resolved = None
+    # Key: location on map, Value: str of radar grid. Radar predictions of previous rescans since entering current map.
+    _map_rescan_radar = None
+
+    def zone_init(self, skip_first_screenshot=True):
+        # Map may have changed since last visit, even it's the same zone.
+        self.map_rescan_cache_reset()
+        return super().zone_init(skip_first_screenshot=skip_first_screenshot)
+
+    def map_rescan_cache_reset(self):
+        self._map_rescan_resolved = set()
+        self._map_rescan_radar = {}
+
+    def map_rescan_radar(self):
+        """
+        Returns:
+            dict: Key: location on map, Value: str of radar grid, such as 'EN', '--'.
+                Current fleet is not included.
+        """
+        self.device.screenshot()
+        self.update_os()
+        self.radar.predict(self.device.image)
+        fleet = self.convert_radar_to_local((0, 0))
+        offset = np.array(fleet.location) + self.camera - self.view.center_loca
+        radar = {}
+        for grid in self.radar:
+            if grid.is_fleet:
+                continue
+            location = tuple(int(v) for v in np.add(grid.location, offset))
+            if location in self.map:
+                radar[location] = grid.str
+        return radar
+
+    def map_rescan_cache_update(self):
+        """
+        Diff radar against previous rescans,
+        forget the resolved camera locations that have changed grids in sight.
+        Cache is dropped when entering a map, see zone_init().
+        """
+        if self._map_rescan_radar is None:
+            self.map_rescan_cache_reset()
+
+        radar = self.map_rescan_radar()
+        changed = [location for location, str_ in radar.items()
+                   if location in self._map_rescan_radar and self._map_rescan_radar[location] != str_]
+        self._map_rescan_radar.update(radar)
+        if changed:
+            logger.info(f'Radar changed: {[location2node(location) for location in changed]}')
+            self._map_rescan_resolved = set([
+                camera for camera in self._map_rescan_resolved
+                if not any([self.grid_is_in_sight(location, camera=camera) for location in changed])
+            ])
+
+    def map_rescan_has_event(self):
+        """
+        Returns:
+            bool: If current view has map events that are not solved.
+        """
+        for event in ['is_akashi', 'is_scanning_device', 'is_logging_tower', 'is_fleet_mechanism']:
+            if event not in self._solved_map_event and self.view.select(**{event: True}):
+                return True
+        return False
 
     def map_rescan_current(self, drop=None):
         """
@@ -532,8 +597,9 @@ class OSMap(OSFleet, Map, GlobeCamera):
             logger.info(f'Found Akashi on {grid}')
             fleet = self.convert_radar_to_local((0, 0))
             if fleet.distance_to(grid) > 1:
+                arrive = self.walk_predict_arrival(grid)
                 self.device.click(grid)
-                result = self.wait_until_walk_stable(drop=drop, walk_out_of_step=False)
+                result = self.wait_until_walk_stable(drop=drop, walk_out_of_step=False, arrive=arrive)
                 if 'akashi' in result:
                     self._solved_map_event.add('is_akashi')
                     return True
@@ -549,8 +615,10 @@ class OSMap(OSFleet, Map, GlobeCamera):
         if 'is_scanning_device' not in self._solved_map_event and grids and grids[0].is_scanning_device:
             grid = grids[0]
             logger.info(f'Found scanning device on {grid}')
+            arrive = self.walk_predict_arrival(grid)
             self.device.click(grid)
-            result = self.wait_until_walk_stable(drop=drop, walk_out_of_step=False, confirm_timer=Timer(1.5, count=4))
+            result = self.wait_until_walk_stable(drop=drop, walk_out_of_step=False, confirm_timer=Timer(1.5, count=4),
+                                                 arrive=arrive)
             self.os_auto_search_run(drop=drop)
             if 'event' in result:
                 self._solved_map_event.add('is_scanning_device')
@@ -562,8 +630,10 @@ class OSMap(OSFleet, Map, GlobeCamera):
         if 'is_logging_tower' not in self._solved_map_event and grids and grids[0].is_logging_tower:
             grid = grids[0]
             logger.info(f'Found logging tower on {grid}')
+            arrive = self.walk_predict_arrival(grid)
             self.device.click(grid)
-            result = self.wait_until_walk_stable(drop=drop, walk_out_of_step=False, confirm_timer=Timer(1.5, count=4))
+            result = self.wait_until_walk_stable(drop=drop, walk_out_of_step=False, confirm_timer=Timer(1.5, count=4),
+                                                 arrive=arrive)
             if 'event' in result:
                 self._solved_map_event.add('is_logging_tower')
                 return True
@@ -577,8 +647,10 @@ class OSMap(OSFleet, Map, GlobeCamera):
                 and grids[0].is_fleet_mechanism:
             grid = grids[0]
             logger.info(f'Found fleet mechanism on {grid}')
+            arrive = self.walk_predict_arrival(grid)
             self.device.click(grid)
-            self.wait_until_walk_stable(drop=drop, walk_out_of_step=False, confirm_timer=Timer(1.5, count=4))
+            self.wait_until_walk_stable(drop=drop, walk_out_of_step=False, confirm_timer=Timer(1.5, count=4),
+                                        arrive=arrive)
 
             if self._solved_fleet_mechanism:
                 logger.info('All fleet mechanism are solved')
@@ -607,6 +679,13 @@ class OSMap(OSFleet, Map, GlobeCamera):
         result = False
 
         queue = self.map.camera_data
+        cache = self.config.OS_MAP_RESCAN_CACHE
+        if cache:
+            self.map_rescan_cache_update()
+            resolved = queue.filter(lambda grid: grid.location in self._map_rescan_resolved)
+            if resolved:
+                logger.info(f'Skip resolved camera: {resolved}')
+                queue = queue.delete(resolved)
         while len(queue) > 0:
             logger.hr(f'Map rescan {queue[0]}')
             queue = queue.sort_by_camera_distance(self.camera)
@@ -616,6 +695,8 @@ class OSMap(OSFleet, Map, GlobeCamera):
             if self.map_rescan_current(drop=drop):
                 result = True
                 break
+            if cache and not self.map_rescan_has_event():
+                self._map_rescan_resolved.add(queue[0].location)
             queue = queue[1:]
 
         logger.info(f'Map rescan once end, result={result}')
@@ -0,0 +1,81 @@
+import cv2
+import numpy as np
+
+from module.base.utils import crop, rgb2gray
+
+
+class MotionDetector:
+    """
+    Detect whether screen is moving, by frame differencing on a downsampled area.
+
+    Difference is the mean absolute difference of grayscale pixels between two frames.
+    It's moving if difference goes above `moving`, and still if difference stays below `still` for `count` frames.
+    Differences in between keep the previous state, so small animations like waves won't make it flicker.
+    """
+
+    def __init__(self, area, resize=0.25, moving=4., still=1.5, count=2):
+        """
+        Args:
+            area (tuple): Area to detect, such as map area without UI.
+            resize (float): Downsample ratio.
+            moving (float): Difference to enter moving state.
+            still (float): Difference to enter still state.
+            count (int): Number of continuous still frames to enter still state.
+        """
+        self.area = area
+        self.resize = resize
+        self.moving = moving
+        self.still = still
+        self.count = count
+        self.reset()
+
+    def reset(self):
+        self.prev = None
+        # Difference of the last 2 frames
+        self.diff = None
+        # State is unknown before continuous still frames.
+        self.is_moving = True
+        self.has_moved = False
+        self.still_count = 0
+
+    @property
+    def is_still(self):
+        return not self.is_moving
+
+    def downsample(self, image):
+        """
+        Args:
+            image (np.ndarray): Screenshot.
+
+        Returns:
+            np.ndarray: Grayscale image.
+        """
+        image = rgb2gray(crop(image, self.area))
+        return cv2.resize(image, None, fx=self.resize, fy=self.resize, interpolation=cv2.INTER_AREA)
+
+    def update(self, image):
+        """
+        Args:
+            image (np.ndarray): Screenshot.
+
+        Returns:
+            bool: If still.
+        """
+        image = self.downsample(image)
+        prev, self.prev = self.prev, image
+        if prev is None:
+            return self.is_still
+
+        self.diff = float(np.mean(cv2.absdiff(image, prev)))
+        if self.diff > self.moving:
+            self.is_moving = True
+            self.has_moved = True
+            self.still_count = 0
+        elif self.diff < self.still:
+            self.still_count += 1
+            if self.still_count >= self.count:
+                self.is_moving = False
+        else:
+            self.still_count = 0
+
+        return self.is_still
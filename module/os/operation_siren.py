@@ -9,9 +9,14 @@ from module.map.map_grids import SelectedGrids
 from module.os.fleet import BossFleet
 from module.os.globe_operation import OSExploreError
 from module.os.map import OSMap
+from module.os.zone_route import route_distance, zone_route
 
 
 class OperationSiren(OSMap):
+    # Planned zones to visit, and zone_id of visited zones
+    _zone_route = []
+    _zone_route_visited = None
+
     def os_port_daily(self, mission=True, supply=True):
         """
         Accept all missions and buy all supplies in all ports.
@@ -161,11 +166,14 @@ class OperationSiren(OSMap):
             else:
                 zones = self.zone_select(hazard_level=self.config.OpsiMeowfficerFarming_HazardLevel) \
                     .delete(SelectedGrids([self.zone])) \
-                    .delete(SelectedGrids(self.zones.select(is_port=True))) \
-                    .sort_by_clock_degree(center=(1252, 1012), start=self.zone.location)
+                    .delete(SelectedGrids(self.zones.select(is_port=True)))
+                if self.config.OS_ZONE_ROUTE:
+                    zone = self.zone_route_next(zones)
+                else:
+                    zone = zones.sort_by_clock_degree(center=(1252, 1012), start=self.zone.location)[0]
 
-                logger.hr(f'OS meowfficer farming, zone_id={zones[0].zone_id}', level=1)
-                self.globe_goto(zones[0])
+                logger.hr(f'OS meowfficer farming, zone_id={zone.zone_id}', level=1)
+                self.globe_goto(zone)
                 self.fleet_set(self.config.OpsiFleet_Fleet)
                 self.os_order_execute(
                     recon_scan=False,
@@ -174,6 +182,42 @@ class OperationSiren(OSMap):
                 self.handle_after_auto_search()
                 self.config.check_task_switch()
 
+    def zone_route_next(self, zones, pinned='SAFE'):
+        """
+        Get the next zone to visit, zones are visited in a planned route that minimizes globe travel.
+        Route is limited to the number of zones that current action points can afford,
+        and re-planned from current zone when finished.
+
+        Args:
+            zones (SelectedGrids): Zones to choose from.
+            pinned (str): Zone type to calculate action point cost.
+
+        Returns:
+            Zone:
+        """
+        if self._zone_route_visited is None:
+            self._zone_route_visited = set()
+        candidate = [zone for zone in zones if zone.zone_id not in self._zone_route_visited]
+        if not candidate:
+            logger.info('All zones visited, start a new round')
+            self._zone_route_visited = set()
+            candidate = list(zones)
+        candidate_id = [zone.zone_id for zone in candidate]
+        self._zone_route = [zone for zone in self._zone_route if zone.zone_id in candidate_id]
+
+        if not self._zone_route:
+            limit = None
+            cost = self.action_point_get_cost(candidate[0], pinned)
+            if self._action_point_total and cost:
+                limit = max((self._action_point_total - self.config.OS_ACTION_POINT_PRESERVE) // cost, 1)
+            self._zone_route = zone_route(self.zone, candidate, limit=limit)
+            logger.info(f'Zone route: {self._zone_route}, '
+                        f'distance: {route_distance(self.zone, self._zone_route):.0f}')
+
+        zone = self._zone_route.pop(0)
+        self._zone_route_visited.add(zone.zone_id)
+        return zone
+
     def _os_explore_task_delay(self):
         """
         Delay other OpSi tasks during os_explore
@@ -1,3 +1,4 @@
+from module.base.decorator import cached_property
 from module.base.mask import Mask
 from module.base.utils import *
 from module.config.config import AzurLaneConfig
@@ -91,7 +92,12 @@ class RadarGrid:
         self.is_port = self.predict_port()
         self.is_question = self.predict_question()
         self.is_archive = self.predict_archive()
+        self.predict_merge()
 
+    def predict_merge(self):
+        """
+        Set attributes that derived from predict results.
+        """
         if self.enemy_genre:
             self.is_enemy = True
         if self.enemy_scale:
@@ -150,6 +156,18 @@ class Radar:
     center_loca = (0, 0)
     port_loca = (0, 0)
 
+    # Same as RadarGrid.predict_*(), predictor name: (area, color, threshold, count)
+    PREDICT_COLORS = {
+        'enemy': ((-3, -3, 3, 3), (247, 89, 49), 221, 10),
+        'boss': ((-3, -3, 3, 3), (147, 12, 8), 221, 10),
+        'resource': ((-3, -3, 3, 3), (66, 231, 165), 221, 10),
+        'meowfficer': ((-3, 0, 3, 6), (33, 186, 255), 221, 10),
+        'exclamation': ((-3, -3, 3, 3), (255, 203, 49), 221, 10),
+        'port': ((-3, -3, 3, 3), (255, 255, 255), 235, 10),
+        'question': ((0, -7, 6, 0), (255, 255, 255), 235, 10),
+        'archive': ((-3, -3, 3, 3), (173, 113, 255), 235, 10),
+    }
+
     def __init__(self, config, center=(1140, 226), delta=(11.7, 11.7), radius=5.15):
         """
         Args:
@@ -192,8 +210,63 @@ class Radar:
             text = ' '.join([self[(x, y)].str if (x, y) in self else '  ' for x in range(*self.shape[0])])
             logger.info(text)
 
+    @cached_property
+    def radar_area(self):
+        """
+        Returns:
+            tuple: Area that covers all predict areas of all grids.
+        """
+        areas = np.array([area_offset(area, grid.center)
+                          for grid in self for area, _, _, _ in self.PREDICT_COLORS.values()])
+        return tuple(np.min(areas[:, :2], axis=0).tolist() + np.max(areas[:, 2:], axis=0).tolist())
+
+    @cached_property
+    def radar_label(self):
+        """
+        Label images of radar area, pixels in the predict area of the n-th grid are labelled n + 1.
+        Radar grids are about 12px away from each other, so predict areas of the same shape never overlap.
+
+        Returns:
+            dict: Key: area, Value: np.ndarray, label image.
+        """
+        origin = self.radar_area[:2]
+        shape = (self.radar_area[3] - self.radar_area[1], self.radar_area[2] - self.radar_area[0])
+        labels = {}
+        for area, _, _, _ in self.PREDICT_COLORS.values():
+            if area in labels:
+                continue
+            label = np.zeros(shape, dtype=np.int32)
+            for index, grid in enumerate(self):
+                x1, y1, x2, y2 = area_offset(area_offset(area, grid.center), [-n for n in origin])
+                label[y1:y2, x1:x2] = index + 1
+            labels[area] = label
+        return labels
+
+    def predict_count(self, image):
+        """
+        Count color pixels of all grids at once.
+        Color similarity of each color is calculated once in radar area, then counted in each grid with np.bincount.
+
+        Args:
+            image: Masked screenshot.
+
+        Returns:
+            dict: Key: predictor name, Value: np.ndarray, number of pixels in each grid, in the order of grids.
+        """
+        image = crop(image, self.radar_area)
+        similarity = {}
+        count = {}
+        for name, (area, color, threshold, _) in self.PREDICT_COLORS.items():
+            if color not in similarity:
+                similarity[color] = color_similarity_2d(image, color=color)
+            label = self.radar_label[area][similarity[color] > threshold]
+            count[name] = np.bincount(label, minlength=len(self.grids) + 1)[1:]
+        return count
+
     def predict(self, image):
         """
+        Same as calling RadarGrid.predict() on all grids.
+
         Args:
             image:
 
@@ -201,10 +274,21 @@ class Radar:
 
         """
         image = MASK_RADAR.apply(image)
-        for grid in self:
+        count = self.predict_count(image)
+        result = {name: count[name] > limit for name, (_, _, _, limit) in self.PREDICT_COLORS.items()}
+        for index, grid in enumerate(self):
             grid.image = image
             grid.reset()
-            grid.predict()
+            if grid.is_fleet:
+                continue
+            grid.is_enemy = bool(result['enemy'][index] or result['boss'][index])
+            grid.is_resource = bool(result['resource'][index])
+            grid.is_meowfficer = bool(result['meowfficer'][index])
+            grid.is_exclamation = bool(result['exclamation'][index])
+            grid.is_port = bool(result['port'][index])
+            grid.is_question = bool(result['question'][index])
+            grid.is_archive = bool(result['archive'][index])
+            grid.predict_merge()
 
     def select(self, **kwargs):
         """
@@ -308,7 +392,7 @@ class Radar:
         self.predict(image)
         for location in [(0, 1), (-1, 0), (1, 0), (0, -1)]:
             grid = self[location]
-            if grid.is_question and not grid.predict_port():
+            if grid.is_question and not grid.is_port:
                 return location
 
         return None
@@ -324,7 +408,7 @@ class Radar:
         self.predict(image)
         for location in [(0, 1), (-1, 0), (1, 0), (0, -1), (0, -2), (0, -3)]:
             grid = self[location]
-            if grid.is_question and not grid.predict_port():
+            if grid.is_question and not grid.is_port:
                 return location
 
         return None
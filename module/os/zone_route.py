@@ -0,0 +1,119 @@
+import numpy as np
+
+
+def zone_route(start, zones, limit=None):
+    """
+    Plan the order to visit zones, minimizing the travel distance on globe.
+    Route starts from nearest neighbour, then improved by 2-opt and Or-opt.
+
+    Args:
+        start (Zone): Current zone.
+        zones (list[Zone]): Zones to visit, not including start.
+        limit (int): Maximum number of zones to visit, such as the number of zones that action points can afford.
+            None for all zones.
+
+    Returns:
+        list[Zone]: Zones in the order to visit.
+    """
+    zones = list(zones)
+    if limit is not None:
+        limit = min(max(limit, 0), len(zones))
+    else:
+        limit = len(zones)
+    if limit <= 0:
+        return []
+
+    # Index 0 is start
+    points = np.array([start.location] + [zone.location for zone in zones], dtype=float)
+    distance = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=2)
+
+    # Nearest neighbour
+    route = [0]
+    remain = set(range(1, len(points)))
+    while len(route) <= limit:
+        current = route[-1]
+        nearest = min(remain, key=lambda index: (distance[current, index], index))
+        route.append(nearest)
+        remain.remove(nearest)
+
+    improved = True
+    while improved:
+        improved = two_opt(route, distance) or or_opt(route, distance)
+
+    return [zones[index - 1] for index in route[1:]]
+
+
+def route_distance(start, route):
+    """
+    Args:
+        start (Zone):
+        route (list[Zone]):
+
+    Returns:
+        float: Travel distance on globe.
+    """
+    points = np.array([start.location] + [zone.location for zone in route], dtype=float)
+    return float(np.sum(np.linalg.norm(np.diff(points, axis=0), axis=1)))
+
+
+def _edge(distance, a, b):
+    return distance[a, b] if b is not None else 0
+
+
+def two_opt(route, distance):
+    """
+    2-opt on an open path, start is fixed.
+
+    Args:
+        route (list[int]): Index of points, route[0] is start. Modified in place.
+        distance (np.ndarray): Distance matrix.
+
+    Returns:
+        bool: If improved.
+    """
+    improved = False
+    for i in range(1, len(route) - 1):
+        for j in range(i + 1, len(route)):
+            a, b = route[i - 1], route[i]
+            c = route[j]
+            d = route[j + 1] if j + 1 < len(route) else None
+            before = distance[a, b] + _edge(distance, c, d)
+            after = distance[a, c] + _edge(distance, b, d)
+            if after < before - 1e-6:
+                route[i:j + 1] = route[i:j + 1][::-1]
+                improved = True
+    return improved
+
+
+def or_opt(route, distance, max_length=3):
+    """
+    Or-opt on an open path, start is fixed.
+    Move a segment of 1 to `max_length` points to another position, which 2-opt can't do.
+
+    Args:
+        route (list[int]): Index of points, route[0] is start. Modified in place.
+        distance (np.ndarray): Distance matrix.
+        max_length (int):
+
+    Returns:
+        bool: If improved.
+    """
+    for length in range(1, max_length + 1):
+        for i in range(1, len(route) - length + 1):
+            segment = route[i:i + length]
+            prev = route[i - 1]
+            next_ = route[i + length] if i + length < len(route) else None
+            removed = distance[prev, segment[0]] + _edge(distance, segment[-1], next_) \
+                - _edge(distance, prev, next_)
+            rest = route[:i] + route[i + length:]
+            for k in range(len(rest)):
+                if k == i - 1:
+                    continue
+                a = rest[k]
+                b = rest[k + 1] if k + 1 < len(rest) else None
+                for insert in [segment, segment[::-1]]:
+                    added = distance[a, insert[0]] + _edge(distance, insert[-1], b) - _edge(distance, a, b)
+                    if added < removed - 1e-6:
+                        route[:] = rest[:k + 1] + insert + rest[k + 1:]
+                        return True
+    return False
@@ -1,3 +1,4 @@
+from module.base.decorator import cached_property
 from module.base.timer import Timer
 from module.combat.assets import *
 from module.exception import CampaignEnd
@@ -144,6 +145,72 @@ class MapEventHandler(EnemySearchingHandler):
 
         return False
 
+    @cached_property
+    def map_event_timer(self):
+        """
+        Returns:
+            dict: Key: handler name, Value: Timer. Handlers that are checked every screenshot are not included.
+        """
+        return {name: Timer(interval) for name, _, interval, _ in self.map_event_triggers() if interval}
+
+    def map_event_triggers(self, drop=None):
+        """
+        Map events handled in handle_map_event(), with the buttons that trigger them.
+        A handler can only return True if one of its buttons appears, with the same offset used in handler.
+
+        Args:
+            drop (DropImage):
+
+        Returns:
+            list[tuple[str, callable, int, list[tuple[Button, Any]]]]:
+                Handler name, handler, check interval in seconds, and [(button, offset), ...].
+                Events that rarely happen are checked every few seconds instead of every screenshot.
+        """
+        return [
+            ('get_items', lambda: self.handle_map_get_items(drop=drop), 0, [
+                (GET_ITEMS_1, 0), (GET_ITEMS_2, 0), (GET_ITEMS_3, 0), (GET_ADAPTABILITY, 0),
+                (GET_MEOWFFICER_ITEMS_1, 0), (GET_MEOWFFICER_ITEMS_2, 0)]),
+            ('game_tips', self.handle_os_game_tips, 1, [(OS_GAME_TIPS, (20, 20))]),
+            ('archives', lambda: self.handle_map_archives(drop=drop), 1, [(MAP_ARCHIVES, 0), (MAP_WORLD, (20, 20))]),
+            ('guild_popup', self.handle_guild_popup_cancel, 1, [(GUILD_POPUP_CONFIRM, self._popup_offset)]),
+            ('ash_popup', self.handle_ash_popup, 0, [(POPUP_CONFIRM, self._popup_offset)]),
+            ('urgent_commission', lambda: self.handle_urgent_commission(drop=drop), 1, [(GET_MISSION, True)]),
+            ('story', self.handle_story_skip, 0, [
+                (POPUP_CANCEL, self._popup_offset), (STORY_LETTER_BLACK, 0),
+                (STORY_SKIP, (20, 20)), (GAME_TIPS, (20, 20))]),
+        ]
+
+    def handle_map_event_dispatch(self, drop=None):
+        """
+        Same as handle_map_event(), but each trigger button is matched at most once per screenshot,
+        and handlers are called only if their buttons appear.
+        Use this in loops that check map events on every screenshot, such as auto search.
+
+        Args:
+            drop (DropImage):
+
+        Returns:
+            bool: If clicked to handle any map event.
+        """
+        appeared = {}
+        for name, handler, _, triggers in self.map_event_triggers(drop=drop):
+            if name in self.map_event_timer and not self.map_event_timer[name].reached_and_reset():
+                continue
+
+            for button, offset in triggers:
+                key = (button.name, offset)
+                if key not in appeared:
+                    appeared[key] = self.appear(button, offset=offset)
+                if appeared[key]:
+                    break
+            else:
+                continue
+
+            if handler():
+                return True
+
+        return False
+
     _os_in_map_confirm_timer = Timer(1.5, count=3)
 
     def handle_os_in_map(self):
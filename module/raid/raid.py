@@ -16,8 +16,7 @@ class OilExhausted(Exception):
 
 
 class RaidCounter(DigitCounter):
-    def pre_process(self, image):
-        image = super().pre_process(image)
+    def after_extract(self, image):
         image = np.pad(image, ((2, 2), (0, 0)), mode='constant', constant_values=255)
         return image
 
@@ -0,0 +1,21 @@
+from module.map_detection.grid_predictor import GridPredictor
+
+
+def test_predictors_acyclic():
+    # Dependencies come earlier in running order, so there is no cycle.
+    order = list(GridPredictor.PREDICTORS.keys())
+    for index, (name, (attrs, depends)) in enumerate(GridPredictor.PREDICTORS.items()):
+        assert attrs and isinstance(attrs, tuple)
+        for depend in depends:
+            assert depend in order[:index], f'{name} depends on {depend}, which is not predicted before it'
+        assert hasattr(GridPredictor, f'predict_{name}')
+
+    for field, depends in GridPredictor.PREDICT_DERIVED.items():
+        for depend in depends:
+            assert depend in GridPredictor.PREDICTORS
+
+
+def test_attributes_set_once():
+    attrs = [attr for attrs, _ in GridPredictor.PREDICTORS.values() for attr in attrs]
+    assert len(attrs) == len(set(attrs))
+    assert not set(attrs).intersection(GridPredictor.PREDICT_DERIVED.keys())
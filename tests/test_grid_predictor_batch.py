@@ -0,0 +1,96 @@
+import cv2
+import numpy as np
+
+from module.config.config import AzurLaneConfig
+from module.map_detection.grid import Grid
+from module.map_detection.grid_predictor_batch import GridPredictorBatch
+from module.template.assets import *
+
+CONFIG = AzurLaneConfig('template')
+CONFIG.MAP_HAS_MYSTERY = True
+CONFIG.MAP_HAS_MISSILE_ATTACK = True
+
+# Screen corners of a 8x3 block of tiles, from HOMO_STORAGE of a real map.
+STORAGE = np.float32([(80.773, 281.635), (1164.829, 281.635), (-20.123, 609.332), (1259.794, 609.332)])
+TILE = 140
+HOMO = cv2.getPerspectiveTransform(
+    np.float32([(0, 0), (8 * TILE, 0), (0, 3 * TILE), (8 * TILE, 3 * TILE)]), STORAGE)
+
+
+def create_grids(image):
+    grids = []
+    for y in range(-1, 3):
+        for x in range(8):
+            points = np.float32([[(x * TILE, y * TILE), ((x + 1) * TILE, y * TILE),
+                                  (x * TILE, (y + 1) * TILE), ((x + 1) * TILE, (y + 1) * TILE)]])
+            corner = cv2.perspectiveTransform(points, HOMO)[0]
+            grids.append(Grid(location=(x, y), image=image, corner=corner, config=CONFIG))
+    return grids
+
+
+def paste(image, grid, area, icon):
+    """
+    Paste icon into the relative area of grid, so relative_crop() gets it back.
+    """
+    x1, y1, x2, y2 = np.rint(grid._image_center + np.array(area) * grid._image_a).astype(int)
+    if x1 < 0 or y1 < 0 or x2 > image.shape[1] or y2 > image.shape[0]:
+        return
+    image[y1:y2, x1:x2] = cv2.resize(icon, (x2 - x1, y2 - y1), interpolation=cv2.INTER_CUBIC)
+
+
+def random_map_image(rng):
+    """
+    Screenshot with enemy genre icons and boss icons on random grids.
+    """
+    image = rng.integers(0, 60, (720, 1280, 3), dtype=np.uint8)
+    templates = [TEMPLATE_ENEMY_Light, TEMPLATE_ENEMY_Main, TEMPLATE_ENEMY_Carrier, TEMPLATE_ENEMY_Treasure]
+    for grid in create_grids(image):
+        value = rng.random()
+        if value < 0.4:
+            template = templates[rng.integers(len(templates))].image
+            icon = rng.integers(0, 40, (60, 60), dtype=np.uint8)
+            x, y = rng.integers(0, 60 - template.shape[1]), rng.integers(0, 60 - template.shape[0])
+            icon[y:y + template.shape[0], x:x + template.shape[1]] = template
+            paste(image, grid, (-0.5, -1, 0.5, 0), np.stack([icon] * 3, axis=-1))
+        elif value < 0.6:
+            icon = np.zeros((20, 50, 3), dtype=np.uint8)
+            icon[1:18, 4:45][TEMPLATE_ENEMY_BOSS.image > 128] = (255, 77, 82)
+            paste(image, grid, (-0.55, -0.2, 0.45, 0.2), icon)
+    return image
+
+
+def grid_result(grid):
+    return (grid.enemy_scale, grid.enemy_genre, grid.is_boss, grid.is_submarine, grid.is_fleet,
+            grid.is_current_fleet, grid.is_mystery, grid.is_missile_attack, grid.is_enemy, grid.is_siren)
+
+
+def test_batch_same_as_grid_predict():
+    rng = np.random.default_rng(0)
+    objects = 0
+    for _ in range(3):
+        image = random_map_image(rng)
+        single = create_grids(image)
+        for grid in single:
+            grid.predict()
+        batch = create_grids(image)
+        assert GridPredictorBatch(batch, CONFIG).available
+        GridPredictorBatch(batch, CONFIG).predict()
+
+        assert [grid_result(grid) for grid in batch] == [grid_result(grid) for grid in single]
+        assert [grid.predicted for grid in batch] == [grid.predicted for grid in single]
+        objects += sum([grid.is_enemy or grid.is_boss for grid in single])
+    assert objects > 0
+
+
+def test_batch_fields():
+    rng = np.random.default_rng(1)
+    image = random_map_image(rng)
+    for fields in [['enemy_genre'], ['is_boss'], ['is_fleet', 'is_current_fleet']]:
+        single = create_grids(image)
+        for grid in single:
+            grid.predict(fields=fields)
+        batch = create_grids(image)
+        GridPredictorBatch(batch, CONFIG).predict(fields=fields)
+
+        assert [grid_result(grid) for grid in batch] == [grid_result(grid) for grid in single]
+        assert [grid.predicted for grid in batch] == [grid.predicted for grid in single]
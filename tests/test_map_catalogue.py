@@ -0,0 +1,41 @@
+import os
+import shutil
+
+from module.map.map_catalogue import MapCatalogue
+
+
+def test_build_and_find(tmp_path):
+    catalogue = MapCatalogue(file=str(tmp_path / 'map_catalogue.pkl'))
+    assert catalogue.build() > 500
+
+    entries = catalogue.find(name='campaign_7_2')
+    assert [entry['folder'] for entry in entries] == ['campaign_main']
+    assert entries[0]['server'] is None
+    for entry in catalogue.find(server='en'):
+        assert entry['server'] in ['en', None]
+
+    # Loaded from file
+    catalogue = MapCatalogue(file=str(tmp_path / 'map_catalogue.pkl'))
+    map_ = catalogue.load_map('campaign_main', 'campaign_7_2')
+    assert map_.name == '7-2'
+    assert map_.shape == (7, 4)
+    assert map_.spawn_data
+    assert catalogue.load_map('campaign_main', 'campaign_99_9') is None
+
+
+def test_modified_file(tmp_path):
+    folder = tmp_path / 'campaign'
+    os.makedirs(folder / 'campaign_main')
+    file = folder / 'campaign_main' / 'campaign_7_2.py'
+    shutil.copy('./campaign/campaign_main/campaign_7_2.py', file)
+    catalogue = MapCatalogue(file=str(tmp_path / 'map_catalogue.pkl'), folder=str(folder))
+    catalogue.build()
+    assert catalogue.get('campaign_main', 'campaign_7_2')['map_name'] == '7-2'
+
+    # Re-parsed on access
+    with open(file, 'r', encoding='utf-8') as f:
+        text = f.read().replace("CampaignMap('7-2')", "CampaignMap('7-3')")
+    with open(file, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.utime(file, (0, 0))
+    assert catalogue.get('campaign_main', 'campaign_7_2')['map_name'] == '7-3'
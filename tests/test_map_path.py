@@ -0,0 +1,112 @@
+import random
+
+from module.map.map_base import CampaignMap
+
+
+def random_map(shape, seed):
+    """
+    Args:
+        shape (str): Such as 'H5'.
+        seed (int):
+
+    Returns:
+        CampaignMap:
+    """
+    rng = random.Random(seed)
+    map_ = CampaignMap('test')
+    map_.shape = shape
+    for grid in map_:
+        value = rng.random()
+        if value < 0.15:
+            grid.is_land = True
+        elif value < 0.3:
+            grid.may_enemy = True
+            grid.is_enemy = True
+        elif value < 0.5:
+            grid.may_ambush = True
+    map_.grid_connection_initial()
+    return map_
+
+
+def find_path_initial_old(map_, location, has_ambush=True, has_enemy=True):
+    """
+    Path finding before Dijkstra, which re-relaxes all visited grids each round.
+
+    Returns:
+        dict: Key: location, Value: cost.
+    """
+    ambush_cost = 10 if has_ambush else 1
+    for grid in map_:
+        grid.cost = 9999
+    start = map_[location]
+    start.cost = 0
+    visited = {start}
+    while 1:
+        new = visited.copy()
+        for grid in visited:
+            for arr in map_.grid_connection[grid.location]:
+                arr = map_[arr]
+                if arr.is_land or arr.is_mechanism_block:
+                    continue
+                cost = ambush_cost if arr.may_ambush else 1
+                cost += grid.cost
+                if cost < arr.cost:
+                    arr.cost = cost
+                if arr.is_sea or not has_enemy:
+                    new.add(arr)
+        if len(new) == len(visited):
+            break
+        visited = new
+    return {grid.location: grid.cost for grid in map_}
+
+
+def path_cost(map_, location, ambush_cost):
+    """
+    Follow grid.connection back to start, sum up the cost of each step.
+    """
+    cost = 0
+    while map_[location].connection is not None:
+        cost += ambush_cost if map_[location].may_ambush else 1
+        location = map_[location].connection
+    return cost, location
+
+
+def test_find_path_initial():
+    for seed in range(50):
+        map_ = random_map('H5' if seed % 2 else 'K8', seed=seed)
+        start = [grid for grid in map_ if grid.is_sea][0].location
+        for has_ambush in [True, False]:
+            for has_enemy in [True, False]:
+                old = find_path_initial_old(map_, start, has_ambush=has_ambush, has_enemy=has_enemy)
+                map_.find_path_initial(start, has_ambush=has_ambush, has_enemy=has_enemy)
+                new = {grid.location: grid.cost for grid in map_}
+
+                # Same reachable grids, and never worse than the old one.
+                assert set(k for k, v in old.items() if v < 9999) == set(k for k, v in new.items() if v < 9999)
+                assert all(new[k] <= old[k] for k in new)
+                if not has_ambush:
+                    assert new == old
+
+                ambush_cost = 10 if has_ambush else 1
+                for grid in map_:
+                    if grid.cost >= 9999 or grid.location == start:
+                        continue
+                    assert path_cost(map_, grid.location, ambush_cost) == (grid.cost, start)
+
+
+def test_find_path_initial_cache():
+    map_ = random_map('H5', seed=1)
+    start = [grid for grid in map_ if grid.is_sea][0].location
+    map_.find_path_initial(start, has_ambush=True)
+    before = {grid.location: grid.cost for grid in map_}
+
+    # Clear an enemy, result should be re-calculated
+    enemy = [grid for grid in map_ if grid.is_enemy][0]
+    enemy.is_enemy = False
+    map_.find_path_initial(start, has_ambush=True)
+    cost, _ = map_._find_path_dijkstra(start, ambush_cost=10, has_enemy=True)
+    assert {grid.location: grid.cost for grid in map_} == {grid.location: cost.get(grid.location, 9999) for grid in map_}
+
+    enemy.is_enemy = True
+    map_.find_path_initial(start, has_ambush=True)
+    assert {grid.location: grid.cost for grid in map_} == before
@@ -0,0 +1,109 @@
+import itertools
+import random
+
+from module.map.map_base import CampaignMap
+from module.map.map_planner import BattlePlanner
+
+
+def random_map(seed):
+    """
+    Args:
+        seed (int):
+
+    Returns:
+        CampaignMap: 6x5 map with lands, enemies and ambush grids.
+    """
+    rng = random.Random(seed)
+    map_ = CampaignMap('test')
+    map_.shape = 'F5'
+    for grid in map_:
+        value = rng.random()
+        if value < 0.15:
+            grid.is_land = True
+        elif value < 0.3:
+            grid.is_enemy = True
+        elif value < 0.5:
+            grid.may_ambush = True
+    map_.grid_connection_initial()
+    return map_
+
+
+def brute_force(planner, start, enemies, targets, battle):
+    """
+    Returns:
+        int: Minimum total cost of all enemy sequences, None if unable to reach targets.
+    """
+    best = None
+    for sequence in itertools.permutations(enemies, battle):
+        total = 0
+        loca = start
+        cleared = frozenset()
+        for enemy in sequence:
+            cost = planner.cost_from(loca, cleared)
+            if enemy not in cost:
+                break
+            total += cost[enemy]
+            loca = enemy
+            cleared = cleared | {enemy}
+        else:
+            cost = planner.cost_from(loca, cleared)
+            reach = [cost[target] for target in targets if target in cost]
+            if reach and (best is None or total + min(reach) < best):
+                best = total + min(reach)
+    return best
+
+
+def plan_cost(planner, start, sequence, targets):
+    total = 0
+    loca = start
+    cleared = frozenset()
+    for enemy in sequence:
+        total += planner.cost_from(loca, cleared)[enemy]
+        loca = enemy
+        cleared = cleared | {enemy}
+    cost = planner.cost_from(loca, cleared)
+    return total + min([cost[target] for target in targets if target in cost])
+
+
+def test_cost_from_same_as_find_path_initial():
+    for seed in range(20):
+        map_ = random_map(seed)
+        planner = BattlePlanner(map_, has_ambush=True)
+        for grid in map_:
+            if not grid.is_sea:
+                continue
+            cost, _ = map_._find_path_dijkstra(grid.location, ambush_cost=10, has_enemy=True)
+            assert planner.cost_from(grid.location, frozenset()) == cost
+
+
+def test_plan_optimal():
+    planned = 0
+    for seed in range(40):
+        map_ = random_map(seed)
+        sea = [grid.location for grid in map_ if grid.is_sea and not grid.may_ambush]
+        enemies = [grid.location for grid in map_ if grid.is_enemy]
+        if len(sea) < 2 or len(enemies) < 3:
+            continue
+        start, target = sea[0], sea[-1]
+        # Large beam makes it an exhaustive search
+        planner = BattlePlanner(map_, has_ambush=True, beam_width=10000)
+        for battle in [1, 2, 3]:
+            sequence = planner.plan(start, enemies, [target], battle=battle)
+            best = brute_force(planner, start, enemies, [target], battle)
+            if best is None:
+                assert sequence == []
+            else:
+                assert len(sequence) == battle
+                assert plan_cost(planner, start, sequence, [target]) == best
+                planned += 1
+    assert planned > 0
+
+
+def test_plan_unreachable():
+    map_ = CampaignMap('test')
+    map_.shape = 'C1'
+    map_[(1, 0)].is_land = True
+    map_.grid_connection_initial()
+    planner = BattlePlanner(map_)
+    assert planner.plan((0, 0), enemies=[(2, 0)], targets=[(0, 0)], battle=1) == []
+    assert planner.plan((0, 0), enemies=[], targets=[(2, 0)], battle=0) == []
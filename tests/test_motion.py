@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+
+from module.os.motion import MotionDetector
+
+AREA = (234, 123, 998, 633)
+
+
+class Scene:
+    """
+    A large random map that camera moves on, screenshots have pixel noise.
+    """
+
+    def __init__(self, seed=0):
+        self.rng = np.random.default_rng(seed)
+        base = self.rng.integers(0, 255, (1400, 2400, 3)).astype(np.uint8)
+        self.base = cv2.GaussianBlur(base, (0, 0), 6)
+        self.base[::60, :] = 200
+        self.base[:, ::60] = 200
+
+    def screenshot(self, x, y, noise=3):
+        image = self.base[y:y + 720, x:x + 1280].astype(int)
+        image += self.rng.integers(-noise, noise + 1, image.shape)
+        return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def test_still():
+    scene = Scene()
+    motion = MotionDetector(AREA)
+    # Unknown state on the first frame
+    assert not motion.update(scene.screenshot(100, 100))
+    assert not motion.update(scene.screenshot(100, 100))
+    assert motion.update(scene.screenshot(100, 100))
+    assert not motion.has_moved
+
+
+def test_move_then_stop():
+    scene = Scene()
+    motion = MotionDetector(AREA)
+    for _ in range(3):
+        motion.update(scene.screenshot(100, 100))
+    assert motion.is_still
+
+    for step in range(1, 6):
+        assert not motion.update(scene.screenshot(100 + 25 * step, 100 + 10 * step))
+        assert motion.has_moved
+
+    # Needs `count` continuous still frames
+    assert not motion.update(scene.screenshot(225, 150))
+    assert motion.update(scene.screenshot(225, 150))
+    assert motion.is_still
+    assert motion.has_moved
+
+    motion.reset()
+    assert motion.is_moving
+    assert not motion.has_moved
+
+
+def test_small_changes_keep_state():
+    scene = Scene()
+    motion = MotionDetector(AREA, count=1)
+    image = scene.screenshot(100, 100, noise=0)
+    motion.update(image)
+    motion.update(image)
+    assert motion.is_still
+
+    # Difference between `still` and `moving` doesn't change state.
+    changed = image.copy()
+    changed[AREA[1]:AREA[3], AREA[0]:AREA[2]] = np.clip(
+        changed[AREA[1]:AREA[3], AREA[0]:AREA[2]].astype(int) + 3, 0, 255).astype(np.uint8)
+    assert motion.update(changed)
+    assert motion.still < motion.diff < motion.moving
+
+    # Changes outside of area are ignored
+    outside = changed.copy()
+    outside[:AREA[1]] = 0
+    assert motion.update(outside)
+    assert motion.diff == 0
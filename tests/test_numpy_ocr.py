@@ -0,0 +1,79 @@
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from module.ocr.numpy_ocr import NumpyOcr, ctc_label, mxnet_reshape
+
+# Recorded by dev_tools/ocr_numpy_record.py
+PARITY_FOLDER = './tests/ocr_parity'
+MODELS = {
+    'azur_lane': 15,
+    'cnocr': 39,
+    'jp': 125,
+    'tw': 63,
+}
+
+
+def test_ctc_label():
+    assert ctc_label([]) == ([], [])
+    assert ctc_label([0, 0, 0]) == ([], [])
+    # Repeated labels are merged, blank splits them.
+    assert ctc_label([0, 3, 3, 0, 3, 5, 5, 0]) == ([3, 3, 5], [(1, 3), (4, 5), (5, 7)])
+    # Label at the end
+    assert ctc_label([2, 2]) == ([2], [(0, 2)])
+
+
+def test_mxnet_reshape():
+    # Examples from mxnet document of reshape
+    assert mxnet_reshape((2, 3, 4), (4, 0, 2)) == (4, 3, 2)
+    assert mxnet_reshape((2, 3, 4), (2, 0, 0)) == (2, 3, 4)
+    assert mxnet_reshape((2, 3, 4), (-2,)) == (2, 3, 4)
+    assert mxnet_reshape((2, 3, 4), (2, -2)) == (2, 3, 4)
+    assert mxnet_reshape((2, 3, 4), (-3, 4)) == (6, 4)
+    assert mxnet_reshape((2, 3, 4, 5), (-3, -3)) == (6, 20)
+    assert mxnet_reshape((2, 3, 4), (0, -3)) == (2, 12)
+    assert mxnet_reshape((2, 3, 4), (-3, -2)) == (6, 4)
+    assert mxnet_reshape((2, 3, 4), (-4, 1, 2, -2)) == (1, 2, 3, 4)
+    assert mxnet_reshape((2, 3, 4), (2, -4, -1, 3, -2)) == (2, 1, 3, 4)
+    assert np.zeros((2, 3, 4)).reshape(mxnet_reshape((2, 3, 4), (6, 1, -1))).shape == (6, 1, 4)
+    # 0 copies the dimension at the same index, -1 is inferred
+    assert np.zeros((2, 3, 4)).reshape(mxnet_reshape((2, 3, 4), (-1, 0))).shape == (8, 3)
+
+
+def render(text):
+    image = np.full((40, 20 * len(text) + 20), 255, dtype=np.uint8)
+    cv2.putText(image, text, (8, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, 0, 2)
+    return image
+
+
+def test_batch_same_as_single():
+    ocr = NumpyOcr(model_epoch=15, root='./bin/cnocr_models/azur_lane')
+    images = [render('12345'), render('78'), render('0/500')]
+    # Images of different width are padded in batch
+    assert ocr.ocr_for_single_lines(images) == [ocr.ocr_for_single_line(image) for image in images]
+    assert ''.join(ocr.ocr_for_single_line(render('78'))) == '78'
+
+
+@pytest.mark.parametrize('name', MODELS.keys())
+def test_same_as_mxnet(name):
+    """
+    Results of NumpyOcr should be the same as the recorded results of AlOcr.
+    """
+    record = f'{PARITY_FOLDER}/{name}.json'
+    params = f'./bin/cnocr_models/{name}/cnocr-v1.2.0-densenet-lite-gru-{MODELS[name]:04d}.params'
+    if not os.path.exists(record) or not os.path.exists(params):
+        pytest.skip(f'Model files or mxnet results not found: {name}')
+    with open(record, 'r', encoding='utf-8') as f:
+        record = json.load(f)
+
+    ocr = NumpyOcr(model_epoch=MODELS[name], root=f'./bin/cnocr_models/{name}', name=name)
+    for index, (chars, probs, confidence) in record.items():
+        image = np.array(Image.open(f'{PARITY_FOLDER}/{index}.png'))
+        result = ocr.ocr_for_single_lines([image], confidence=True)[0]
+        assert result[0] == chars, f'image {index}'
+        assert np.allclose(result[1], probs, atol=1e-4), f'image {index}'
+        assert abs(result[2] - confidence) < 1e-4, f'image {index}'
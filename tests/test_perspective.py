@@ -0,0 +1,77 @@
+import cv2
+import numpy as np
+
+from module.config.config import AzurLaneConfig
+from module.map_detection.perspective import Perspective
+from module.map_detection.utils import Lines
+
+# HOMO_STORAGE of real maps, (tile count, screen corners of these tiles)
+STORAGES = [
+    ((8, 3), [(80.773, 281.635), (1164.829, 281.635), (-20.123, 609.332), (1259.794, 609.332)]),
+    ((8, 5), [(200.097, 82.51), (1200.298, 82.51), (95.065, 506.098), (1335.813, 506.098)]),
+    ((6, 6), [(583.092, 82.574), (1247.528, 82.574), (564.74, 614.947), (1434.046, 614.947)]),
+]
+
+
+def perspective_lines(storage, rng, noise=0.5, outlier=False):
+    """
+    Grid lines of a map on screen, in the format of cv2.HoughLines().
+
+    Returns:
+        Lines, Lines, np.ndarray, float: Horizontal lines, vertical lines, vanish point, x of distant point.
+    """
+    (w, h), corners = storage
+    homo = cv2.getPerspectiveTransform(
+        np.float32([(0, 0), (w, 0), (0, h), (w, h)]), np.float32(corners))
+
+    def screen(points):
+        return cv2.perspectiveTransform(np.float32([points]), homo)[0]
+
+    horizontal = []
+    for y in range(-2, h + 3):
+        _, y1 = screen([(0, y)])[0]
+        if 0 < y1 < 720:
+            horizontal.append((y1 + rng.normal(0, noise), np.pi / 2))
+    vertical = []
+    for x in range(-3, w + 4):
+        (x1, y1), (x2, y2) = screen([(x, 0), (x, h)])
+        theta = np.arctan2(x1 - x2, y2 - y1) % np.pi
+        rho = x1 * np.cos(theta) + y1 * np.sin(theta)
+        if 0 < (rho - 360 * np.sin(theta)) / np.cos(theta) < 1280:
+            vertical.append((rho + rng.normal(0, noise), theta))
+    if outlier:
+        vertical.append((640, 0.3))
+
+    vanish = homo @ [0, 1, 0]
+    distant = homo @ [1, 1, 0]
+    return Lines(horizontal, is_horizontal=True), Lines(vertical, is_horizontal=False), \
+        vanish[:2] / vanish[2], distant[0] / distant[2]
+
+
+def solve(config, horizontal, vertical, brute_force):
+    config.VANISH_POINT_BRUTE_FORCE = brute_force
+    perspective = Perspective(config)
+    perspective.horizontal = horizontal
+    perspective.vertical = vertical
+    perspective.crossings = horizontal.cross(vertical)
+    perspective.vanish_point = perspective.solve_vanish_point()
+    distant = perspective.solve_distant_point()
+    return perspective, perspective.vanish_point, distant[0]
+
+
+def test_fit_same_as_brute_force():
+    config = AzurLaneConfig('template')
+    rng = np.random.default_rng(0)
+    for storage in STORAGES:
+        for outlier in [False, True]:
+            horizontal, vertical, vanish, distant = perspective_lines(storage, rng, outlier=outlier)
+            perspective, fit_vanish, fit_distant = solve(config, horizontal, vertical, brute_force=False)
+            _, brute_vanish, brute_distant = solve(config, horizontal, vertical, brute_force=True)
+
+            # Fitted results are at least as good as brute force on the objective
+            assert perspective._vanish_point_value(fit_vanish) <= perspective._vanish_point_value(brute_vanish) + 1e-3
+            # and close to brute force and ground truth.
+            assert np.linalg.norm(fit_vanish - brute_vanish) < 20
+            assert np.linalg.norm(fit_vanish - vanish) < 20
+            assert abs(fit_distant - brute_distant) < 20
+            assert abs(fit_distant - distant) < 20
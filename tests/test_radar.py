@@ -0,0 +1,60 @@
+import numpy as np
+
+from module.os.radar import MASK_RADAR, Radar
+
+
+class Config:
+    MAP_HAS_SIREN = False
+
+
+def random_radar_image(rng):
+    """
+    Screenshot with random color blocks in radar, colors are close to the ones in Radar.PREDICT_COLORS.
+    """
+    colors = [color for _, color, _, _ in Radar.PREDICT_COLORS.values()]
+    image = rng.integers(0, 64, (720, 1280, 3), dtype=np.uint8)
+    for _ in range(400):
+        x = int(rng.integers(1070, 1210))
+        y = int(rng.integers(156, 296))
+        w, h = rng.integers(2, 7, 2)
+        color = np.array(colors[rng.integers(len(colors))]) + rng.integers(-8, 8, 3)
+        image[y:y + h, x:x + w] = np.clip(color, 0, 255)
+    return image
+
+
+def radar_result(radar):
+    return {grid.location: (grid.str, grid.is_enemy, grid.is_resource, grid.is_meowfficer, grid.is_exclamation,
+                            grid.is_port, grid.is_question, grid.is_archive, grid.enemy_genre)
+            for grid in radar}
+
+
+def test_predict_count():
+    radar = Radar(Config())
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        image = MASK_RADAR.apply(random_radar_image(rng))
+        count = radar.predict_count(image)
+        for index, grid in enumerate(radar):
+            grid.image = image
+            for name, (area, color, threshold, limit) in Radar.PREDICT_COLORS.items():
+                assert grid.image_color_count(area, color, threshold=threshold, count=limit) \
+                       == (count[name][index] > limit)
+
+
+def test_predict_same_as_grid_predict():
+    radar = Radar(Config())
+    rng = np.random.default_rng(1)
+    objects = 0
+    for _ in range(50):
+        image = random_radar_image(rng)
+        radar.predict(image)
+        batch = radar_result(radar)
+
+        image = MASK_RADAR.apply(image)
+        for grid in radar:
+            grid.image = image
+            grid.reset()
+            grid.predict()
+        assert batch == radar_result(radar)
+        objects += sum(value[0] != '--' for value in batch.values())
+    assert objects > 0
@@ -0,0 +1,54 @@
+import itertools
+from collections import namedtuple
+
+import numpy as np
+
+from module.os.zone_route import route_distance, zone_route
+
+Zone = namedtuple('Zone', ['zone_id', 'location'])
+
+
+def random_zones(rng, count):
+    return [Zone(zone_id=index, location=tuple(rng.integers(0, 2000, 2).tolist())) for index in range(count)]
+
+
+def test_zone_route_limit():
+    rng = np.random.default_rng(0)
+    start, *zones = random_zones(rng, 10)
+    assert zone_route(start, zones, limit=0) == []
+    assert zone_route(start, zones, limit=-1) == []
+    assert zone_route(start, []) == []
+    for limit in [1, 5, 9, 20, None]:
+        route = zone_route(start, zones, limit=limit)
+        assert len(route) == min(limit if limit is not None else 9, 9)
+        assert len(set(route)) == len(route)
+        assert set(route).issubset(zones)
+
+
+def test_zone_route_all_zones():
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        start, *zones = random_zones(rng, 7)
+        route = zone_route(start, zones)
+        assert sorted(route) == sorted(zones)
+
+        best = min(route_distance(start, permutation) for permutation in itertools.permutations(zones))
+        # Not optimal, but should be close
+        assert route_distance(start, route) <= best * 1.1
+
+        # Not worse than nearest neighbour
+        current, remain, nearest = start, list(zones), []
+        while remain:
+            current = min(remain, key=lambda zone: np.linalg.norm(np.subtract(zone.location, current.location)))
+            remain.remove(current)
+            nearest.append(current)
+        assert route_distance(start, route) <= route_distance(start, nearest) + 1e-6
+
+
+def test_zone_route_line():
+    # Zones on a line, visit one side then the other
+    start = Zone(zone_id=0, location=(0, 0))
+    zones = [Zone(zone_id=x, location=(x, 0)) for x in [-3, -1, 2, 5, 6]]
+    route = zone_route(start, zones)
+    assert [zone.zone_id for zone in route] == [-1, -3, 2, 5, 6]
+    assert route_distance(start, route) == 1 + 2 + 5 + 3 + 1